@@ -134,7 +134,7 @@ class Architect:
         """
         if message.message_type == MessageType.TASK:
             # Handle task message
-            task = Task.from_json(message.to_json())
+            task = Task.from_message(message)
             result = await self.execute_task(task)
             
             # Create and send response
@@ -172,15 +172,23 @@ async def main() -> None:
         return
     
     # Initialize the ChatLLM adapter
-    adapter = ChatLLMAdapter(api_key=api_key)
-    
-    # Run examples
-    print("Running homeBRO demo with ChatLLM...")
-    
-    await analyze_code_example(adapter)
-    await generate_code_example(adapter)
-    await refactor_code_example(adapter)
-    await fix_bug_example(adapter)
+    async with ChatLLMAdapter(api_key=api_key) as adapter:
+        # Run examples
+        print("Running homeBRO demo with ChatLLM...")
+        
+        # The examples are independent, so their API calls can overlap. Each one prints its
+        # section after its response arrives, which keeps the output readable.
+        results = await asyncio.gather(
+            analyze_code_example(adapter),
+            generate_code_example(adapter),
+            refactor_code_example(adapter),
+            fix_bug_example(adapter),
+            return_exceptions=True
+        )
+    
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Demo example failed: %s", result)
     
     print("\nDemo completed!")
 
@@ -5,18 +5,127 @@ This module implements the ChatLLM adapter for the homeBRO system, which provide
 an interface to interact with ChatLLM's API for various AI tasks.
 """
 
+import asyncio
+import copy
+import gzip
+import hashlib
 import logging
-import json
-from typing import Dict, Any, Optional, List
-import requests
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple, Union
+import httpx
+import orjson
+
+# Logging is configured by the application entrypoint
 logger = logging.getLogger("homeBRO.ChatLLMAdapter")
 
+# HTTP status codes worth retrying: rate limiting and transient server errors
+_RETRYABLE_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+# Request bodies larger than this many bytes are gzip-compressed when compression is enabled
+_COMPRESSION_THRESHOLD = 2048
+
+# Prompt templates, filled in with str.format by the task helpers
+_ANALYZE_TEMPLATE = """Please analyze the following code for the task: {task}
+
+Code:
+```python
+{code}
+```
+
+Provide a detailed analysis including:
+1. Code quality assessment
+2. Potential issues or bugs
+3. Performance considerations
+4. Security considerations
+5. Recommendations for improvement
+"""
+
+_GENERATE_SYSTEM_TEMPLATE = """You are an expert software developer. Your task is to generate high-quality code based on the given specification.
+Task type: {task_type}
+
+Follow these guidelines:
+1. Write clean, maintainable, and well-documented code
+2. Follow best practices and design patterns
+3. Include appropriate error handling
+4. Add comments explaining complex logic
+5. Consider performance and security
+"""
+
+_REFACTOR_TEMPLATE = """Please refactor the following code according to these requirements:
+
+{requirements_str}
+
+Original code:
+```python
+{code}
+```
+
+Provide the refactored code with explanations of the changes made.
+"""
+
+_FIX_BUG_TEMPLATE = """Please fix the following bug in the code:
+
+Bug description: {bug_description}
+
+Code:
+```python
+{code}
+```
+
+Provide the fixed code with an explanation of the bug and the fix.
+"""
+
+_BATCH_SYSTEM_PROMPT = """You will receive several numbered tasks, each wrapped in a <taskN> tag.
+Answer every task independently, wrapping each answer in the same <taskN></taskN> tag as its task.
+"""
+
+# Matches one answer block in a batched completion
+_BATCH_ANSWER_RE = re.compile(r"<task(\d+)>(.*?)</task\1>", re.DOTALL)
+
+# Matches a fenced markdown code block, capturing its body
+_CODE_FENCE_RE = re.compile(r"```[\w+-]*\n(.*?)```", re.DOTALL)
+
+# MinHash parameters for spotting near-duplicate prompts: words are grouped into shingles of
+# _SHINGLE_SIZE, and each of the universal hash functions (a * h + b) mod _MINHASH_PRIME
+# contributes one signature component. The seed keeps signatures stable across runs.
+_WORD_RE = re.compile(r"\w+")
+_SHINGLE_SIZE = 3
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_RNG = random.Random(0)
+_MINHASH_COEFFICIENTS = tuple(
+    (_MINHASH_RNG.randrange(1, _MINHASH_PRIME), _MINHASH_RNG.randrange(0, _MINHASH_PRIME))
+    for _ in range(128)
+)
+
+
+def _minhash_signature(text: str) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a text's word shingles.
+    
+    Args:
+        text: The text to sign
+        
+    Returns:
+        The signature, or an empty tuple if the text has no words
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return ()
+    
+    shingles = {" ".join(words[i:i + _SHINGLE_SIZE]) for i in range(max(1, len(words) - _SHINGLE_SIZE + 1))}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        for shingle in shingles
+    ]
+    
+    return tuple(
+        min((a * h + b) % _MINHASH_PRIME for h in hashes)
+        for a, b in _MINHASH_COEFFICIENTS
+    )
+
 class ChatLLMAdapter:
     """
     The ChatLLM adapter for the homeBRO system.
@@ -25,28 +134,283 @@ class ChatLLMAdapter:
     It handles authentication, request formatting, and response parsing.
     """
     
-    def __init__(self, api_key: str, base_url: str = "https://api.chatllm.com/v1"):
+    def __init__(self, 
+                 api_key: str, 
+                 base_url: str = "https://api.chatllm.com/v1",
+                 cache_size: int = 256,
+                 cache_ttl: Optional[float] = None,
+                 max_concurrency: int = 8,
+                 max_retries: int = 4,
+                 retry_initial_delay: float = 1.0,
+                 retry_max_delay: float = 30.0,
+                 compress_requests: bool = True,
+                 near_duplicate_threshold: Optional[float] = None):
         """
         Initialize the ChatLLM adapter.
         
         Args:
             api_key: The ChatLLM API key
             base_url: The base URL for the ChatLLM API
+            cache_size: The maximum number of deterministic completions to cache
+            cache_ttl: Optional lifetime in seconds of a cached completion
+            max_concurrency: The maximum number of requests in flight at once
+            max_retries: The number of times a rate-limited or failed request is retried
+            retry_initial_delay: The backoff delay in seconds before the first retry
+            retry_max_delay: The maximum backoff delay in seconds between retries
+            compress_requests: Whether to gzip large request bodies
+            near_duplicate_threshold: The estimated word-shingle similarity above which a
+                cached completion is reused for a different prompt, or None (the default) to
+                only reuse completions for identical requests. Enabling it returns the
+                completion of a similar prompt, which is wrong whenever the difference matters
+                (e.g. code that differs by one token), and adds a MinHash computation and a
+                scan of the cache to every lookup
         """
         self.api_key = api_key
         self.base_url = base_url
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_retries = max_retries
+        self.retry_initial_delay = retry_initial_delay
+        self.retry_max_delay = retry_max_delay
+        self.compress_requests = compress_requests
+        self.near_duplicate_threshold = near_duplicate_threshold
+        
+        # Caps concurrent requests so bursts of tasks stay under the API rate limits
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Completions for temperature 0 requests, keyed by a hash of the request payload and
+        # stored with the monotonic time they were cached, the request settings other than the
+        # prompt, and the prompt's MinHash signature, in least recently used order
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any], Tuple[Any, ...], Tuple[int, ...]]]" = OrderedDict()
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        
+        # Shared client so requests reuse pooled keep-alive connections
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0)
+        )
         logger.info("ChatLLM adapter initialized")
     
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP client and its pooled connections.
+        """
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> "ChatLLMAdapter":
+        """
+        Warm up a pooled connection so the first request does not pay for the TLS handshake.
+        
+        Returns:
+            The adapter
+        """
+        try:
+            # Any response, even an error status, leaves an open connection in the pool
+            await self._client.head("")
+        except httpx.HTTPError as e:
+            logger.debug("Connection warm-up failed: %s", e)
+        
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """
+        Close the adapter when leaving the context.
+        """
+        await self.aclose()
+    
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """
+        Compute how long to wait before retrying a request.
+        
+        Args:
+            attempt: The zero-based number of the attempt that failed
+            response: The failed response, if the server sent one
+            
+        Returns:
+            The Retry-After delay if the server sent one, otherwise a jittered exponential backoff
+        """
+        if response is not None:
+            try:
+                return min(float(response.headers["retry-after"]), self.retry_max_delay)
+            except (KeyError, ValueError):
+                pass
+        
+        delay = self.retry_initial_delay * 2 ** attempt + random.uniform(0, self.retry_initial_delay)
+        return min(delay, self.retry_max_delay)
+    
+    def _encode_payload(self, payload: Dict[str, Any]) -> Tuple[bytes, Optional[Dict[str, str]]]:
+        """
+        Encode a request payload, compressing it if it is large.
+        
+        Args:
+            payload: The request payload
+            
+        Returns:
+            The request body and any extra headers it needs
+        """
+        # The client headers already declare the JSON content type
+        body = orjson.dumps(payload)
+        if self.compress_requests and len(body) > _COMPRESSION_THRESHOLD:
+            return gzip.compress(body, compresslevel=1), {"Content-Encoding": "gzip"}
+        
+        return body, None
+    
+    async def _post_completion(self, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        Post a completion request, retrying rate-limited, server and transport errors.
+        
+        Args:
+            payload: The request payload
+            
+        Returns:
+            The successful response
+        """
+        body, headers = self._encode_payload(payload)
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._client.post("/chat/completions", content=body, headers=headers)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, e.response)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt, None)
+            
+            logger.warning("Completion request failed (attempt %d), retrying in %.1fs", attempt + 1, delay)
+            await asyncio.sleep(delay)
+    
+    async def _stream_completion(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream a completion, parsing the server-sent events as they arrive.
+        
+        Args:
+            payload: The request payload, with streaming enabled
+            
+        Returns:
+            An async iterator over the completion text chunks
+        """
+        body, headers = self._encode_payload(payload)
+        
+        try:
+            async with self._semaphore:
+                async with self._client.stream("POST", "/chat/completions", content=body, headers=headers) as response:
+                    response.raise_for_status()
+                    
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        
+                        choices = orjson.loads(data).get("choices")
+                        content = choices[0].get("delta", {}).get("content") if choices else None
+                        if content:
+                            yield content
+            
+        except Exception as e:
+            logger.error("Error streaming completion: %s", e)
+            raise
+    
+    @staticmethod
+    def _cache_key(payload: Dict[str, Any]) -> str:
+        """
+        Compute the cache key for a request payload.
+        
+        Args:
+            payload: The request payload
+            
+        Returns:
+            The SHA-256 hex digest of the canonical JSON encoding of the payload
+        """
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached completion, evicting it if it has expired.
+        
+        Args:
+            key: The cache key
+            
+        Returns:
+            A copy of the cached completion, or None if there is no fresh entry
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        cached_at, completion = entry[:2]
+        if self.cache_ttl is not None and time.monotonic() - cached_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        
+        self._cache.move_to_end(key)
+        return copy.copy(completion)
+    
+    def _get_near_duplicate(self, settings: Tuple[Any, ...], signature: Tuple[int, ...]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached completion for a prompt similar to one already answered.
+        
+        Args:
+            settings: The request settings other than the prompt
+            signature: The MinHash signature of the prompt
+            
+        Returns:
+            A copy of the most similar fresh cached completion above the similarity threshold,
+            or None if there is none
+        """
+        if not signature:
+            return None
+        
+        best_key, best_similarity = None, self.near_duplicate_threshold
+        for key, (cached_at, _, cached_settings, cached_signature) in self._cache.items():
+            if cached_settings != settings or not cached_signature:
+                continue
+            
+            similarity = sum(map(int.__eq__, signature, cached_signature)) / len(signature)
+            if similarity > best_similarity:
+                best_key, best_similarity = key, similarity
+        
+        return self._get_cached(best_key) if best_key is not None else None
+    
+    def _store_cached(self, 
+                      key: str, 
+                      completion: Dict[str, Any],
+                      settings: Tuple[Any, ...],
+                      signature: Tuple[int, ...]) -> None:
+        """
+        Cache a completion, evicting the least recently used entry when full.
+        
+        Args:
+            key: The cache key
+            completion: The completion to cache
+            settings: The request settings other than the prompt
+            signature: The MinHash signature of the prompt, or an empty tuple
+        """
+        self._cache[key] = (time.monotonic(), copy.copy(completion), settings, signature)
+        self._cache.move_to_end(key)
+        
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
     async def generate_completion(self, 
                                 prompt: str, 
                                 model: str = "claude-3-sonnet", 
                                 temperature: float = 0.7,
                                 max_tokens: int = 4000,
-                                system_prompt: Optional[str] = None) -> Dict[str, Any]:
+                                system_prompt: Optional[str] = None,
+                                stream: bool = False) -> Union[Dict[str, Any], AsyncIterator[str]]:
         """
         Generate a completion using ChatLLM.
         
@@ -56,9 +420,11 @@ class ChatLLMAdapter:
             temperature: The temperature for generation
             max_tokens: The maximum number of tokens to generate
             system_prompt: Optional system prompt to guide the model
+            stream: Whether to stream the completion text as it is generated
             
         Returns:
-            A dictionary containing the generated completion and metadata
+            A dictionary containing the generated completion and metadata, or an async
+            iterator over the completion text chunks when streaming
         """
         try:
             # Prepare the request payload
@@ -74,34 +440,111 @@ class ChatLLMAdapter:
             if system_prompt:
                 payload["messages"].insert(0, {"role": "system", "content": system_prompt})
             
-            # Make the API request
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload
-            )
+            # Streamed completions bypass the cache and are consumed by the caller
+            if stream:
+                payload["stream"] = True
+                return self._stream_completion(payload)
             
-            # Check for errors
-            response.raise_for_status()
+            # Only deterministic requests are served from the cache
+            cache_key = None
+            if temperature == 0 and self.cache_size > 0:
+                cache_key = self._cache_key(payload)
+                cached = self._get_cached(cache_key)
+                
+                # On an exact miss, fall back to a prompt that differs only slightly
+                settings = (model, max_tokens, system_prompt)
+                signature = ()
+                if cached is None and self.near_duplicate_threshold is not None:
+                    signature = _minhash_signature(prompt)
+                    cached = self._get_near_duplicate(settings, signature)
+                
+                if cached is not None:
+                    logger.debug("Returning cached completion for model %s", model)
+                    return cached
+            
+            # Make the API request
+            async with self._semaphore:
+                response = await self._post_completion(payload)
             
             # Parse the response
-            result = response.json()
+            result = orjson.loads(response.content)
             
-            return {
+            completion = {
                 "completion": result["choices"][0]["message"]["content"],
                 "model": model,
                 "usage": result.get("usage", {}),
                 "finish_reason": result["choices"][0].get("finish_reason", "stop")
             }
             
+            if cache_key is not None:
+                self._store_cached(cache_key, completion, settings, signature)
+            
+            return completion
+            
         except Exception as e:
-            logger.error(f"Error generating completion: {str(e)}")
+            logger.error("Error generating completion: %s", e)
             raise
     
+    @staticmethod
+    def extract_code(text: str) -> str:
+        """
+        Extract the first fenced code block from a completion.
+        
+        Args:
+            text: The completion text
+            
+        Returns:
+            The body of the first fenced code block, or the text unchanged if it has none
+        """
+        match = _CODE_FENCE_RE.search(text)
+        return match.group(1) if match else text
+    
+    async def batch_generate(self, 
+                             prompts: List[str], 
+                             model: str = "claude-3-sonnet", 
+                             temperature: float = 0.7,
+                             max_tokens: int = 4000) -> List[Dict[str, Any]]:
+        """
+        Generate completions for several prompts with a single request.
+        
+        The prompts are packed into one message as numbered tasks, and the completion is
+        split back into one answer per prompt.
+        
+        Args:
+            prompts: The input prompts
+            model: The model to use
+            temperature: The temperature for generation
+            max_tokens: The maximum number of tokens to generate for all prompts together
+            
+        Returns:
+            A list of dictionaries, one per prompt in order, each containing its completion and
+            the metadata of the shared request. A prompt the model did not answer gets an empty
+            completion.
+        """
+        if not prompts:
+            return []
+        
+        packed_prompt = "\n".join(f"<task{i}>\n{prompt}\n</task{i}>" for i, prompt in enumerate(prompts))
+        result = await self.generate_completion(
+            packed_prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system_prompt=_BATCH_SYSTEM_PROMPT
+        )
+        
+        answers = {int(index): answer.strip() for index, answer in _BATCH_ANSWER_RE.findall(result["completion"])}
+        
+        return [
+            {**result, "completion": answers.get(i, "")}
+            for i in range(len(prompts))
+        ]
+    
     async def analyze_code(self, 
                           code: str, 
                           task: str,
-                          model: str = "claude-3-sonnet") -> Dict[str, Any]:
+                          model: str = "claude-3-sonnet",
+                          stream: bool = False) -> Union[Dict[str, Any], AsyncIterator[str]]:
         """
         Analyze code using ChatLLM.
         
@@ -109,31 +552,23 @@ class ChatLLMAdapter:
             code: The code to analyze
             task: The analysis task description
             model: The model to use
+            stream: Whether to stream the completion text as it is generated
             
         Returns:
-            A dictionary containing the analysis results
+            A dictionary containing the analysis results, or an async iterator
+            over its text chunks when streaming
         """
-        prompt = f"""Please analyze the following code for the task: {task}
-
-Code:
-```python
-{code}
-```
-
-Provide a detailed analysis including:
-1. Code quality assessment
-2. Potential issues or bugs
-3. Performance considerations
-4. Security considerations
-5. Recommendations for improvement
-"""
-        
-        return await self.generate_completion(prompt, model=model)
+        return await self.generate_completion(
+            _ANALYZE_TEMPLATE.format(code=code, task=task),
+            model=model,
+            stream=stream
+        )
     
     async def generate_code(self, 
                            specification: str, 
                            task_type: str,
-                           model: str = "claude-3-sonnet") -> Dict[str, Any]:
+                           model: str = "claude-3-sonnet",
+                           stream: bool = False) -> Union[Dict[str, Any], AsyncIterator[str]]:
         """
         Generate code based on a specification.
         
@@ -141,31 +576,26 @@ Provide a detailed analysis including:
             specification: The code specification
             task_type: The type of code generation task
             model: The model to use
+            stream: Whether to stream the completion text as it is generated
             
         Returns:
-            A dictionary containing the generated code and metadata
+            A dictionary containing the generated code and metadata, or an async iterator
+            over its text chunks when streaming
         """
-        system_prompt = f"""You are an expert software developer. Your task is to generate high-quality code based on the given specification.
-Task type: {task_type}
-
-Follow these guidelines:
-1. Write clean, maintainable, and well-documented code
-2. Follow best practices and design patterns
-3. Include appropriate error handling
-4. Add comments explaining complex logic
-5. Consider performance and security
-"""
+        system_prompt = _GENERATE_SYSTEM_TEMPLATE.format(task_type=task_type)
         
         return await self.generate_completion(
             specification,
             model=model,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            stream=stream
         )
     
     async def refactor_code(self, 
                            code: str, 
                            requirements: List[str],
-                           model: str = "claude-3-sonnet") -> Dict[str, Any]:
+                           model: str = "claude-3-sonnet",
+                           stream: bool = False) -> Union[Dict[str, Any], AsyncIterator[str]]:
         """
         Refactor code based on requirements.
         
@@ -173,30 +603,25 @@ Follow these guidelines:
             code: The code to refactor
             requirements: List of refactoring requirements
             model: The model to use
+            stream: Whether to stream the completion text as it is generated
             
         Returns:
-            A dictionary containing the refactored code and metadata
+            A dictionary containing the refactored code and metadata, or an async iterator
+            over its text chunks when streaming
         """
-        requirements_str = "\n".join(f"- {req}" for req in requirements)
-        
-        prompt = f"""Please refactor the following code according to these requirements:
-
-{requirements_str}
-
-Original code:
-```python
-{code}
-```
-
-Provide the refactored code with explanations of the changes made.
-"""
+        requirements_str = "\n".join(map("- {}".format, requirements))
         
-        return await self.generate_completion(prompt, model=model)
+        return await self.generate_completion(
+            _REFACTOR_TEMPLATE.format(requirements_str=requirements_str, code=code),
+            model=model,
+            stream=stream
+        )
     
     async def fix_bug(self, 
                       code: str, 
                       bug_description: str,
-                      model: str = "claude-3-sonnet") -> Dict[str, Any]:
+                      model: str = "claude-3-sonnet",
+                      stream: bool = False) -> Union[Dict[str, Any], AsyncIterator[str]]:
         """
         Fix a bug in the code.
         
@@ -204,20 +629,14 @@ Provide the refactored code with explanations of the changes made.
             code: The code containing the bug
             bug_description: Description of the bug
             model: The model to use
+            stream: Whether to stream the completion text as it is generated
             
         Returns:
-            A dictionary containing the fixed code and metadata
+            A dictionary containing the fixed code and metadata, or an async iterator
+            over its text chunks when streaming
         """
-        prompt = f"""Please fix the following bug in the code:
-
-Bug description: {bug_description}
-
-Code:
-```python
-{code}
-```
-
-Provide the fixed code with an explanation of the bug and the fix.
-"""
-        
-        return await self.generate_completion(prompt, model=model) 
\ No newline at end of file
+        return await self.generate_completion(
+            _FIX_BUG_TEMPLATE.format(bug_description=bug_description, code=code),
+            model=model,
+            stream=stream
+        ) 
\ No newline at end of file
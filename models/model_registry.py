@@ -8,15 +8,167 @@ retrieved, and queried based on various criteria.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Set
+import sys
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, List, Any, Mapping, Optional, Set, Tuple
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the application entrypoint
 logger = logging.getLogger("ROOcode.ModelRegistry")
 
+# Scalar model fields indexed for find_models_by_criteria
+_INDEXED_FIELDS = ("provider", "version", "size", "context_window")
+
+# Capability sets shared by the default models
+_CAPS_BASIC = (
+    "natural_language_understanding",
+    "code_generation",
+    "reasoning",
+    "instruction_following"
+)
+_CAPS_FULL = _CAPS_BASIC + ("system_design", "debugging")
+_CAPS_COMPLEX = _CAPS_FULL + ("complex_reasoning",)
+
+# Fields common to the default models
+_DEFAULT_MODEL_BASE = {
+    "provider": "ChatLLM",
+    "context_window": 200000
+}
+
+# Default models as (model name, fields that differ from _DEFAULT_MODEL_BASE)
+_DEFAULT_MODELS = (
+    ("claude-3-sonnet", {
+        "version": "3",
+        "size": "Sonnet",
+        "capabilities": _CAPS_FULL,
+        "performance": {
+            "reasoning": 0.9,
+            "code_generation": 0.85,
+            "system_design": 0.9,
+            "debugging": 0.8
+        },
+        "cost": {
+            "input_tokens": 0.00000325,
+            "output_tokens": 0.00001550
+        },
+        "description": "Claude 3 Sonnet via ChatLLM is a powerful and efficient model with strong reasoning and code generation capabilities."
+    }),
+    ("claude-3-opus", {
+        "version": "3",
+        "size": "Opus",
+        "capabilities": _CAPS_COMPLEX,
+        "performance": {
+            "reasoning": 0.95,
+            "code_generation": 0.9,
+            "system_design": 0.95,
+            "debugging": 0.9
+        },
+        "cost": {
+            "input_tokens": 0.00001500,
+            "output_tokens": 0.00007500
+        },
+        "description": "Claude 3 Opus via ChatLLM is the most capable model, excelling at complex reasoning and system design tasks."
+    }),
+    ("claude-3-haiku", {
+        "version": "3",
+        "size": "Haiku",
+        "capabilities": _CAPS_BASIC,
+        "performance": {
+            "reasoning": 0.8,
+            "code_generation": 0.75,
+            "system_design": 0.7,
+            "debugging": 0.65
+        },
+        "cost": {
+            "input_tokens": 0.00000025,
+            "output_tokens": 0.00000125
+        },
+        "description": "Claude 3 Haiku via ChatLLM is a fast and cost-effective model suitable for simpler tasks."
+    }),
+    ("gpt-4", {
+        "version": "4",
+        "capabilities": _CAPS_COMPLEX,
+        "performance": {
+            "reasoning": 0.95,
+            "code_generation": 0.9,
+            "system_design": 0.95,
+            "debugging": 0.9
+        },
+        "cost": {
+            "input_tokens": 0.00003,
+            "output_tokens": 0.00006
+        },
+        "context_window": 128000,
+        "description": "GPT-4 via ChatLLM is a highly capable model with excellent reasoning and code generation abilities."
+    }),
+    ("gpt-4-turbo", {
+        "version": "4",
+        "size": "Turbo",
+        "capabilities": _CAPS_COMPLEX,
+        "performance": {
+            "reasoning": 0.95,
+            "code_generation": 0.9,
+            "system_design": 0.95,
+            "debugging": 0.9
+        },
+        "cost": {
+            "input_tokens": 0.00001,
+            "output_tokens": 0.00003
+        },
+        "context_window": 128000,
+        "description": "GPT-4 Turbo via ChatLLM is a faster and more cost-effective version of GPT-4 with similar capabilities."
+    })
+)
+
+def _freeze_model_info(model_info: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Make a read-only copy of model information.
+    
+    Args:
+        model_info: The model information
+        
+    Returns:
+        A read-only view of the model information, with capabilities stored as a tuple of
+        interned strings, the performance and cost tables as read-only views, and the
+        summaries used by constraint checks precomputed as "_avg_performance" (None when
+        there are no performance metrics) and "_output_cost"
+    """
+    frozen = dict(model_info)
+    
+    if "capabilities" in frozen:
+        frozen["capabilities"] = tuple(sys.intern(capability) for capability in frozen["capabilities"])
+    
+    for key in ("performance", "cost"):
+        if key in frozen:
+            frozen[key] = MappingProxyType(dict(frozen[key]))
+    
+    performance = frozen.get("performance", {})
+    frozen["_avg_performance"] = sum(performance.values()) / len(performance) if performance else None
+    frozen["_output_cost"] = frozen.get("cost", {}).get("output_tokens", 0)
+    
+    return MappingProxyType(frozen)
+
+def _thaw_model_info(model_info: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Make a plain copy of frozen model information for callers outside the registry.
+    
+    Args:
+        model_info: The frozen model information
+        
+    Returns:
+        A dictionary of the model information, with capabilities as a list, the performance
+        and cost tables as dictionaries, and the precomputed summaries left out
+    """
+    thawed = {key: value for key, value in model_info.items() if not key.startswith("_")}
+    
+    if "capabilities" in thawed:
+        thawed["capabilities"] = list(thawed["capabilities"])
+    
+    for key in ("performance", "cost"):
+        if key in thawed:
+            thawed[key] = dict(thawed[key])
+    
+    return thawed
+
 class ModelRegistry:
     """
     The ModelRegistry component of the ROOcode system.
@@ -26,6 +178,12 @@ class ModelRegistry:
     and query model capabilities.
     """
     
+    # Default catalog and its indices, built by the first registry and copied by later ones
+    _DEFAULT_CATALOG: Optional[Mapping[str, Mapping[str, Any]]] = None
+    _DEFAULT_CAPABILITY_INDEX: Optional[Mapping[str, Dict[str, None]]] = None
+    _DEFAULT_CAPABILITY_SETS: Optional[Mapping[str, FrozenSet[str]]] = None
+    _DEFAULT_FIELD_INDICES: Optional[Mapping[str, Dict[Any, Dict[str, None]]]] = None
+    
     def __init__(self, default_model: str = "claude-3-sonnet"):
         """
         Initialize the ModelRegistry with a default model.
@@ -35,8 +193,24 @@ class ModelRegistry:
         """
         self.models = {}
         self.default_model = default_model
+        
+        # Inverted indices from a capability or indexed field value to the models that have it.
+        # Dicts with None values are used as insertion-ordered sets so that lookups return
+        # models in registration order.
+        self._capability_index: Dict[str, Dict[str, None]] = {}
+        
+        # Each model's capabilities, and every capability any model has, for set queries
+        self._capability_sets: Dict[str, FrozenSet[str]] = {}
+        self._capability_universe: FrozenSet[str] = frozenset()
+        self._field_indices: Dict[str, Dict[Any, Dict[str, None]]] = {field: {} for field in _INDEXED_FIELDS}
+        
+        # Model names in registration order, rebuilt lazily after the registry changes
+        self._names_snapshot: Optional[Tuple[str, ...]] = None
+        
+        # Callbacks run after models are registered or removed or the default model changes
+        self._change_listeners: List[Callable[[], None]] = []
         self._register_default_models()
-        logger.info(f"ModelRegistry initialized with default model: {default_model}")
+        logger.info("ModelRegistry initialized with default model: %s", default_model)
     
     def register_model(self, model_name: str, model_info: Dict[str, Any]) -> None:
         """
@@ -46,11 +220,80 @@ class ModelRegistry:
             model_name: The name of the model
             model_info: Information about the model, including capabilities, performance, and cost
         """
-        if model_name in self.models:
-            logger.warning(f"Model {model_name} already registered, updating information")
+        # Freeze first so that invalid model information leaves the registry untouched
+        model_info = _freeze_model_info(model_info)
+        
+        existing = self.models.get(model_name)
+        if existing is not None:
+            logger.warning("Model %s already registered, updating information", model_name)
+            self._unindex_model(model_name, existing)
         
         self.models[model_name] = model_info
-        logger.info(f"Registered model: {model_name}")
+        self._index_model(model_name, model_info)
+        self._names_snapshot = None
+        logger.info("Registered model: %s", model_name)
+        self._notify_change()
+    
+    def unregister_model(self, model_name: str) -> bool:
+        """
+        Remove a model from the registry.
+        
+        Args:
+            model_name: The name of the model
+            
+        Returns:
+            True if successful, False if the model is not registered or is the default model
+        """
+        if model_name not in self.models:
+            logger.warning("Cannot unregister model: %s not found in registry", model_name)
+            return False
+        
+        if model_name == self.default_model:
+            logger.warning("Cannot unregister the default model: %s", model_name)
+            return False
+        
+        self._unindex_model(model_name, self.models.pop(model_name))
+        self._names_snapshot = None
+        logger.info("Unregistered model: %s", model_name)
+        self._notify_change()
+        return True
+    
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback to run whenever the registry changes.
+        
+        Args:
+            listener: A callable taking no arguments, such as a cache's clear method
+        """
+        self._change_listeners.append(listener)
+    
+    def _notify_change(self) -> None:
+        """
+        Run the change listeners.
+        """
+        for listener in self._change_listeners:
+            listener()
+    
+    def __contains__(self, model_name: object) -> bool:
+        """
+        Check whether a model is registered.
+        
+        Args:
+            model_name: The name of the model
+            
+        Returns:
+            True if the model is registered
+        """
+        return model_name in self.models
+    
+    def __len__(self) -> int:
+        """
+        Get the number of registered models.
+        
+        Returns:
+            The number of registered models
+        """
+        return len(self.models)
     
     def get_model(self, model_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -60,20 +303,20 @@ class ModelRegistry:
             model_name: The name of the model
             
         Returns:
-            The model information, or None if the model is not registered
+            A copy of the model information, or None if the model is not registered
         """
         if model_name not in self.models:
-            logger.warning(f"Model {model_name} not found in registry")
+            logger.warning("Model %s not found in registry", model_name)
             return None
         
-        return self.models[model_name]
+        return _thaw_model_info(self.models[model_name])
     
     def get_default_model(self) -> Dict[str, Any]:
         """
         Get information about the default model.
         
         Returns:
-            The default model information
+            A copy of the default model information
         """
         return self.get_model(self.default_model)
     
@@ -88,11 +331,12 @@ class ModelRegistry:
             True if successful, False if the model is not registered
         """
         if model_name not in self.models:
-            logger.warning(f"Cannot set default model: {model_name} not found in registry")
+            logger.warning("Cannot set default model: %s not found in registry", model_name)
             return False
         
         self.default_model = model_name
-        logger.info(f"Default model set to: {model_name}")
+        logger.info("Default model set to: %s", model_name)
+        self._notify_change()
         return True
     
     def list_models(self) -> List[str]:
@@ -102,7 +346,10 @@ class ModelRegistry:
         Returns:
             A list of model names
         """
-        return list(self.models.keys())
+        if self._names_snapshot is None:
+            self._names_snapshot = tuple(self.models)
+        
+        return list(self._names_snapshot)
     
     def find_models_by_capability(self, capability: str) -> List[str]:
         """
@@ -114,14 +361,44 @@ class ModelRegistry:
         Returns:
             A list of model names that have the specified capability
         """
-        matching_models = []
+        return list(self._capability_index.get(capability, ()))
+    
+    def find_models_with_all(self, capabilities: Iterable[str]) -> List[str]:
+        """
+        Find models that have all of the given capabilities.
         
-        for model_name, model_info in self.models.items():
-            capabilities = model_info.get("capabilities", [])
-            if capability in capabilities:
-                matching_models.append(model_name)
+        Args:
+            capabilities: The capabilities to search for
+            
+        Returns:
+            A list of model names that have every one of the capabilities
+        """
+        needed = frozenset(capabilities)
+        if not needed:
+            return self.list_models()
+        
+        if not needed <= self._capability_universe:
+            return []
+        
+        # Walk the models with the rarest capability and check the rest as a subset
+        candidates = min((self._capability_index[capability] for capability in needed), key=len)
+        return [model_name for model_name in candidates if needed <= self._capability_sets[model_name]]
+    
+    def find_models_with_any(self, capabilities: Iterable[str]) -> List[str]:
+        """
+        Find models that have at least one of the given capabilities.
+        
+        Args:
+            capabilities: The capabilities to search for
+            
+        Returns:
+            A list of model names that have any of the capabilities
+        """
+        needed = frozenset(capabilities)
+        if needed.isdisjoint(self._capability_universe):
+            return []
         
-        return matching_models
+        return [model_name for model_name in self.models if not needed.isdisjoint(self._capability_sets[model_name])]
     
     def find_models_by_criteria(self, criteria: Dict[str, Any]) -> List[str]:
         """
@@ -133,158 +410,142 @@ class ModelRegistry:
         Returns:
             A list of model names that match the criteria
         """
-        matching_models = []
+        # Narrow the candidates with the field indices, then check the remaining criteria
+        indexed_matches = []
+        remaining_criteria = {}
         
-        for model_name, model_info in self.models.items():
-            matches = True
+        for key, value in criteria.items():
+            # Model information stores sequences as tuples, so match lists against them too
+            if isinstance(value, list):
+                value = tuple(value)
+            
+            index = self._field_indices.get(key)
+            if index is None:
+                remaining_criteria[key] = value
+                continue
             
-            for key, value in criteria.items():
-                if key not in model_info or model_info[key] != value:
-                    matches = False
-                    break
+            try:
+                matches = index.get(value)
+            except TypeError:
+                # Unhashable values have to be compared directly
+                remaining_criteria[key] = value
+                continue
             
-            if matches:
-                matching_models.append(model_name)
+            # No model has this value, so nothing can match all the criteria
+            if not matches:
+                return []
+            indexed_matches.append(matches)
+        
+        # Walk the smallest candidate set and probe the others
+        if indexed_matches:
+            indexed_matches.sort(key=len)
+            candidates, other_matches = indexed_matches[0], indexed_matches[1:]
+        else:
+            candidates, other_matches = self.models, []
+        
+        return [
+            model_name for model_name in candidates
+            if all(model_name in matches for matches in other_matches)
+            and all(key in self.models[model_name] and self.models[model_name][key] == value
+                    for key, value in remaining_criteria.items())
+        ]
+    
+    def _index_model(self, model_name: str, model_info: Mapping[str, Any]) -> None:
+        """
+        Add a model to the capability and field indices.
+        
+        Args:
+            model_name: The name of the model
+            model_info: The model information
+        """
+        capabilities = frozenset(model_info.get("capabilities", ()))
+        for capability in capabilities:
+            self._capability_index.setdefault(capability, {})[model_name] = None
+        
+        self._capability_sets[model_name] = capabilities
+        self._capability_universe = self._capability_universe | capabilities
         
-        return matching_models
+        for field, index in self._field_indices.items():
+            if field in model_info:
+                try:
+                    index.setdefault(model_info[field], {})[model_name] = None
+                except TypeError:
+                    # Unhashable values are matched by find_models_by_criteria scanning instead
+                    pass
+    
+    def _unindex_model(self, model_name: str, model_info: Mapping[str, Any]) -> None:
+        """
+        Remove a model from the capability and field indices.
+        
+        Args:
+            model_name: The name of the model
+            model_info: The model information it was indexed with
+        """
+        for capability in model_info.get("capabilities", []):
+            models = self._capability_index.get(capability)
+            if models is not None:
+                models.pop(model_name, None)
+                if not models:
+                    del self._capability_index[capability]
+        
+        self._capability_sets.pop(model_name, None)
+        self._capability_universe = frozenset(self._capability_index)
+        
+        for field, index in self._field_indices.items():
+            try:
+                models = index.get(model_info.get(field))
+            except TypeError:
+                continue
+            if models is not None:
+                models.pop(model_name, None)
+                if not models:
+                    del index[model_info[field]]
+    
+    def _rebuild_indices(self) -> None:
+        """
+        Rebuild the capability and field indices from the registered models.
+        """
+        self._capability_index = {}
+        self._capability_sets = {}
+        self._capability_universe = frozenset()
+        self._field_indices = {field: {} for field in _INDEXED_FIELDS}
+        
+        for model_name, model_info in self.models.items():
+            self._index_model(model_name, model_info)
     
     def _register_default_models(self) -> None:
         """
         Register the default set of models with the registry.
+        
+        The catalog is built once per process; later registries copy it and its indices
+        rather than registering each model again. The read-only model entries are shared.
         """
-        # Register ChatLLM Claude 3 Sonnet
-        self.register_model("claude-3-sonnet", {
-            "provider": "ChatLLM",
-            "version": "3",
-            "size": "Sonnet",
-            "capabilities": [
-                "natural_language_understanding",
-                "code_generation",
-                "reasoning",
-                "instruction_following",
-                "system_design",
-                "debugging"
-            ],
-            "performance": {
-                "reasoning": 0.9,
-                "code_generation": 0.85,
-                "system_design": 0.9,
-                "debugging": 0.8
-            },
-            "cost": {
-                "input_tokens": 0.00000325,
-                "output_tokens": 0.00001550
-            },
-            "context_window": 200000,
-            "description": "Claude 3 Sonnet via ChatLLM is a powerful and efficient model with strong reasoning and code generation capabilities."
-        })
-        
-        # Register ChatLLM Claude 3 Opus
-        self.register_model("claude-3-opus", {
-            "provider": "ChatLLM",
-            "version": "3",
-            "size": "Opus",
-            "capabilities": [
-                "natural_language_understanding",
-                "code_generation",
-                "reasoning",
-                "instruction_following",
-                "system_design",
-                "debugging",
-                "complex_reasoning"
-            ],
-            "performance": {
-                "reasoning": 0.95,
-                "code_generation": 0.9,
-                "system_design": 0.95,
-                "debugging": 0.9
-            },
-            "cost": {
-                "input_tokens": 0.00001500,
-                "output_tokens": 0.00007500
-            },
-            "context_window": 200000,
-            "description": "Claude 3 Opus via ChatLLM is the most capable model, excelling at complex reasoning and system design tasks."
-        })
-        
-        # Register ChatLLM Claude 3 Haiku
-        self.register_model("claude-3-haiku", {
-            "provider": "ChatLLM",
-            "version": "3",
-            "size": "Haiku",
-            "capabilities": [
-                "natural_language_understanding",
-                "code_generation",
-                "reasoning",
-                "instruction_following"
-            ],
-            "performance": {
-                "reasoning": 0.8,
-                "code_generation": 0.75,
-                "system_design": 0.7,
-                "debugging": 0.65
-            },
-            "cost": {
-                "input_tokens": 0.00000025,
-                "output_tokens": 0.00000125
-            },
-            "context_window": 200000,
-            "description": "Claude 3 Haiku via ChatLLM is a fast and cost-effective model suitable for simpler tasks."
-        })
-        
-        # Register ChatLLM GPT-4
-        self.register_model("gpt-4", {
-            "provider": "ChatLLM",
-            "version": "4",
-            "capabilities": [
-                "natural_language_understanding",
-                "code_generation",
-                "reasoning",
-                "instruction_following",
-                "system_design",
-                "debugging",
-                "complex_reasoning"
-            ],
-            "performance": {
-                "reasoning": 0.95,
-                "code_generation": 0.9,
-                "system_design": 0.95,
-                "debugging": 0.9
-            },
-            "cost": {
-                "input_tokens": 0.00003,
-                "output_tokens": 0.00006
-            },
-            "context_window": 128000,
-            "description": "GPT-4 via ChatLLM is a highly capable model with excellent reasoning and code generation abilities."
-        })
-        
-        # Register ChatLLM GPT-4 Turbo
-        self.register_model("gpt-4-turbo", {
-            "provider": "ChatLLM",
-            "version": "4",
-            "size": "Turbo",
-            "capabilities": [
-                "natural_language_understanding",
-                "code_generation",
-                "reasoning",
-                "instruction_following",
-                "system_design",
-                "debugging",
-                "complex_reasoning"
-            ],
-            "performance": {
-                "reasoning": 0.95,
-                "code_generation": 0.9,
-                "system_design": 0.95,
-                "debugging": 0.9
-            },
-            "cost": {
-                "input_tokens": 0.00001,
-                "output_tokens": 0.00003
-            },
-            "context_window": 128000,
-            "description": "GPT-4 Turbo via ChatLLM is a faster and more cost-effective version of GPT-4 with similar capabilities."
-        })
-        
-        logger.info(f"Registered {len(self.models)} default models")
+        if ModelRegistry._DEFAULT_CATALOG is None:
+            self.models.update(
+                (model_name, _freeze_model_info({**_DEFAULT_MODEL_BASE, **overrides}))
+                for model_name, overrides in _DEFAULT_MODELS
+            )
+            self._rebuild_indices()
+            
+            ModelRegistry._DEFAULT_CATALOG = MappingProxyType(dict(self.models))
+            ModelRegistry._DEFAULT_CAPABILITY_INDEX = MappingProxyType(
+                {capability: dict(models) for capability, models in self._capability_index.items()}
+            )
+            ModelRegistry._DEFAULT_CAPABILITY_SETS = MappingProxyType(dict(self._capability_sets))
+            ModelRegistry._DEFAULT_FIELD_INDICES = MappingProxyType({
+                field: {value: dict(models) for value, models in index.items()}
+                for field, index in self._field_indices.items()
+            })
+        else:
+            self.models = dict(ModelRegistry._DEFAULT_CATALOG)
+            self._capability_index = {
+                capability: dict(models) for capability, models in ModelRegistry._DEFAULT_CAPABILITY_INDEX.items()
+            }
+            self._field_indices = {
+                field: {value: dict(models) for value, models in index.items()}
+                for field, index in ModelRegistry._DEFAULT_FIELD_INDICES.items()
+            }
+            self._capability_sets = dict(ModelRegistry._DEFAULT_CAPABILITY_SETS)
+            self._capability_universe = frozenset(self._capability_index)
+        
+        logger.debug("Registered %d default models", len(self.models))
@@ -7,17 +7,116 @@ for selecting the most appropriate AI model for a given task. The selector uses
 model capabilities, and performance metrics to make intelligent model selection decisions.
 """
 
+import functools
 import logging
-from typing import Dict, List, Any, Optional
+import re
+import sys
+from typing import Dict, FrozenSet, List, Any, Mapping, Optional, Tuple
 from .model_registry import ModelRegistry
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by the application entrypoint
 logger = logging.getLogger("ROOcode.ModelSelector")
 
+# Number of distinct task signatures whose selections are remembered
+_SELECTION_CACHE_SIZE = 512
+
+# Number of distinct (task type, requirements) pairs whose capability sets are remembered
+_CAPABILITY_CACHE_SIZE = 1024
+
+# Capabilities required by each task type, and by task types not listed
+_TASK_CAPABILITIES = {
+    "system_design": frozenset(("natural_language_understanding", "reasoning", "system_design")),
+    "component_design": frozenset(("natural_language_understanding", "reasoning", "system_design")),
+    "interface_design": frozenset(("natural_language_understanding", "reasoning", "system_design")),
+    "analyze_requirements": frozenset(("natural_language_understanding", "reasoning")),
+    "implement_component": frozenset(("natural_language_understanding", "code_generation")),
+    "implement_interface": frozenset(("natural_language_understanding", "code_generation")),
+    "refactor_code": frozenset(("natural_language_understanding", "code_generation")),
+    "fix_bug": frozenset(("natural_language_understanding", "code_generation", "debugging")),
+    "test_component": frozenset(("natural_language_understanding", "code_generation", "debugging")),
+    "validate_interface": frozenset(("natural_language_understanding", "code_generation", "debugging")),
+    "performance_test": frozenset(("natural_language_understanding", "code_generation", "debugging"))
+}
+_DEFAULT_TASK_CAPABILITIES = frozenset(("natural_language_understanding", "instruction_following"))
+
+# Performance metrics relevant to each task type, and to task types not listed
+_TASK_METRICS = {
+    "system_design": ("system_design", "reasoning"),
+    "component_design": ("system_design", "reasoning"),
+    "interface_design": ("system_design", "reasoning"),
+    "analyze_requirements": ("reasoning",),
+    "implement_component": ("code_generation",),
+    "implement_interface": ("code_generation",),
+    "refactor_code": ("code_generation",),
+    "fix_bug": ("debugging", "code_generation"),
+    "test_component": ("debugging", "code_generation"),
+    "validate_interface": ("debugging", "code_generation"),
+    "performance_test": ("debugging",)
+}
+_DEFAULT_TASK_METRICS = ("reasoning",)
+
+# Keywords in requirements and constraints that affect model selection, matched anywhere in
+# the lowercased text so each string is scanned once
+_REQUIREMENT_KEYWORD_RE = re.compile(r"complex|reasoning|optimize|performance|security")
+_CONSTRAINT_KEYWORD_RE = re.compile(r"low cost|budget|high performance|provider:")
+
+# Output token cost above which a model fails a "low cost" or "budget" constraint
+_LOW_COST_MAX_OUTPUT_COST = 0.00003
+
+# Average performance below which a model fails a "high performance" constraint
+_HIGH_PERFORMANCE_MIN_AVERAGE = 0.85
+
+
+def _within_output_cost(model_info: Mapping[str, Any], max_cost: float) -> bool:
+    """
+    Check that a model's output token cost does not exceed a maximum.
+    
+    Args:
+        model_info: The model information, as stored by the registry
+        max_cost: The maximum output token cost
+        
+    Returns:
+        True if the model is within the cost
+    """
+    return model_info["_output_cost"] <= max_cost
+
+
+def _meets_average_performance(model_info: Mapping[str, Any], min_average: float) -> bool:
+    """
+    Check that a model's average performance reaches a minimum.
+    
+    Args:
+        model_info: The model information, as stored by the registry
+        min_average: The minimum average performance
+        
+    Returns:
+        True if the model has performance metrics averaging at least the minimum
+    """
+    average = model_info["_avg_performance"]
+    return average is not None and average >= min_average
+
+
+def _has_provider(model_info: Mapping[str, Any], provider: str) -> bool:
+    """
+    Check that a model comes from a provider.
+    
+    Args:
+        model_info: The model information
+        provider: The lowercase provider name
+        
+    Returns:
+        True if the model's provider matches, ignoring case
+    """
+    return model_info.get("provider", "").lower() == provider
+
+
+# Constraint checks by kind, as produced by ModelSelector._compile_constraints
+_CONSTRAINT_CHECKS = {
+    "max_output_cost": _within_output_cost,
+    "min_average_performance": _meets_average_performance,
+    "provider": _has_provider
+}
+
 class ModelSelector:
     """
     The ModelSelector component of the ROOcode system.
@@ -34,6 +133,13 @@ class ModelSelector:
             model_registry: The ModelRegistry containing available models
         """
         self.model_registry = model_registry
+        
+        # Selections by task signature and model scores by task type, dropped whenever the
+        # registry changes
+        self._select_cached = functools.lru_cache(maxsize=_SELECTION_CACHE_SIZE)(self._select_for_signature)
+        self._score_table: Dict[str, Dict[str, float]] = {}
+        model_registry.add_change_listener(self._select_cached.cache_clear)
+        model_registry.add_change_listener(self._score_table.clear)
         logger.info("ModelSelector initialized")
     
     def select_model(self, task: Dict[str, Any]) -> str:
@@ -46,20 +152,39 @@ class ModelSelector:
         Returns:
             The name of the selected model
         """
+        # Check if a specific model is requested
+        requested_model = task.get("model")
+        if requested_model is not None and requested_model in self.model_registry.models:
+            logger.info("Using explicitly requested model: %s", requested_model)
+            return requested_model
+        if "model" in task:
+            logger.warning("Requested model %s not found, falling back to selection logic", requested_model)
+        
         # Extract task characteristics
         task_type = task.get("task_type", "")
-        requirements = task.get("requirements", [])
-        constraints = task.get("constraints", [])
+        # Requirements and constraints are matched case-insensitively and drawn from a small
+        # vocabulary, so normalize and intern them once here
+        requirements = [sys.intern(requirement.lower()) for requirement in task.get("requirements", [])]
+        constraints = [sys.intern(constraint.lower()) for constraint in task.get("constraints", [])]
         
-        # Check if a specific model is requested
-        if "model" in task:
-            requested_model = task["model"]
-            if self.model_registry.get_model(requested_model):
-                logger.info(f"Using explicitly requested model: {requested_model}")
-                return requested_model
-            else:
-                logger.warning(f"Requested model {requested_model} not found, falling back to selection logic")
+        # The order of requirements and constraints does not affect the selection
+        return self._select_cached(task_type, tuple(sorted(requirements)), tuple(sorted(constraints)))
+    
+    def _select_for_signature(self, 
+                              task_type: str, 
+                              requirements: Tuple[str, ...], 
+                              constraints: Tuple[str, ...]) -> str:
+        """
+        Select the most appropriate model for a task signature.
         
+        Args:
+            task_type: The type of task
+            requirements: The task requirements
+            constraints: The task constraints
+            
+        Returns:
+            The name of the selected model
+        """
         # Determine required capabilities based on task type
         required_capabilities = self._determine_required_capabilities(task_type, requirements)
         
@@ -67,78 +192,65 @@ class ModelSelector:
         candidate_models = self._find_candidate_models(required_capabilities)
         
         if not candidate_models:
-            logger.warning(f"No models found with required capabilities: {required_capabilities}")
-            logger.info(f"Falling back to default model: {self.model_registry.default_model}")
+            logger.warning("No models found with required capabilities: %s", required_capabilities)
+            logger.info("Falling back to default model: %s", self.model_registry.default_model)
             return self.model_registry.default_model
         
         # Apply constraints to filter candidates
         filtered_candidates = self._apply_constraints(candidate_models, constraints)
         
         if not filtered_candidates:
-            logger.warning(f"No models satisfy constraints: {constraints}")
-            logger.info(f"Falling back to candidates without constraints: {candidate_models}")
+            logger.warning("No models satisfy constraints: %s", constraints)
+            logger.info("Falling back to candidates without constraints: %s", candidate_models)
             filtered_candidates = candidate_models
         
-        # Rank the remaining candidates
-        ranked_models = self._rank_models(filtered_candidates, task_type, requirements)
+        # Select the highest-ranked of the remaining candidates
+        selected_model = self._top_model(filtered_candidates, task_type)
         
-        if not ranked_models:
+        if selected_model is None:
             logger.warning("No models available after ranking")
-            logger.info(f"Falling back to default model: {self.model_registry.default_model}")
+            logger.info("Falling back to default model: %s", self.model_registry.default_model)
             return self.model_registry.default_model
         
-        # Select the highest-ranked model
-        selected_model = ranked_models[0]
-        logger.info(f"Selected model for task type '{task_type}': {selected_model}")
+        logger.info("Selected model for task type '%s': %s", task_type, selected_model)
         
         return selected_model
     
-    def _determine_required_capabilities(self, task_type: str, requirements: List[str]) -> List[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=_CAPABILITY_CACHE_SIZE)
+    def _determine_required_capabilities(task_type: str, requirements: Tuple[str, ...]) -> FrozenSet[str]:
         """
         Determine the capabilities required for a task based on its type and requirements.
         
+        The result depends only on the arguments, so it is memoized across all selectors.
+        
         Args:
             task_type: The type of task
-            requirements: The task requirements
+            requirements: The task requirements, as a sorted tuple
             
         Returns:
-            A list of required capabilities
+            The set of required capabilities
         """
-        # Map task types to required capabilities
-        task_capability_map = {
-            "system_design": ["natural_language_understanding", "reasoning", "system_design"],
-            "component_design": ["natural_language_understanding", "reasoning", "system_design"],
-            "interface_design": ["natural_language_understanding", "reasoning", "system_design"],
-            "analyze_requirements": ["natural_language_understanding", "reasoning"],
-            "implement_component": ["natural_language_understanding", "code_generation"],
-            "implement_interface": ["natural_language_understanding", "code_generation"],
-            "refactor_code": ["natural_language_understanding", "code_generation"],
-            "fix_bug": ["natural_language_understanding", "code_generation", "debugging"],
-            "test_component": ["natural_language_understanding", "code_generation", "debugging"],
-            "validate_interface": ["natural_language_understanding", "code_generation", "debugging"],
-            "performance_test": ["natural_language_understanding", "code_generation", "debugging"]
-        }
-        
         # Get the base capabilities for the task type
-        capabilities = task_capability_map.get(task_type, ["natural_language_understanding", "instruction_following"])
+        capabilities = _TASK_CAPABILITIES.get(task_type, _DEFAULT_TASK_CAPABILITIES)
         
         # Add additional capabilities based on requirements
+        extra_capabilities = set()
         for requirement in requirements:
-            requirement_lower = requirement.lower()
-            
-            if "complex" in requirement_lower and "reasoning" in requirement_lower:
-                capabilities.append("complex_reasoning")
+            keywords = set(_REQUIREMENT_KEYWORD_RE.findall(requirement.lower()))
+            if not keywords:
+                continue
             
-            if "optimize" in requirement_lower or "performance" in requirement_lower:
-                capabilities.append("debugging")
+            if "complex" in keywords and "reasoning" in keywords:
+                extra_capabilities.add("complex_reasoning")
             
-            if "security" in requirement_lower:
-                capabilities.append("debugging")
+            # Optimization, performance and security work all call for debugging
+            if not keywords.isdisjoint(("optimize", "performance", "security")):
+                extra_capabilities.add("debugging")
         
-        # Remove duplicates
-        return list(set(capabilities))
+        return capabilities | extra_capabilities if extra_capabilities else capabilities
     
-    def _find_candidate_models(self, required_capabilities: List[str]) -> List[str]:
+    def _find_candidate_models(self, required_capabilities: FrozenSet[str]) -> List[str]:
         """
         Find models that have all the required capabilities.
         
@@ -148,20 +260,9 @@ class ModelSelector:
         Returns:
             A list of model names that have all the required capabilities
         """
-        all_models = self.model_registry.list_models()
-        candidate_models = []
-        
-        for model_name in all_models:
-            model_info = self.model_registry.get_model(model_name)
-            model_capabilities = model_info.get("capabilities", [])
-            
-            # Check if the model has all required capabilities
-            if all(capability in model_capabilities for capability in required_capabilities):
-                candidate_models.append(model_name)
-        
-        return candidate_models
+        return self.model_registry.find_models_with_all(required_capabilities)
     
-    def _apply_constraints(self, candidate_models: List[str], constraints: List[str]) -> List[str]:
+    def _apply_constraints(self, candidate_models: List[str], constraints: Tuple[str, ...]) -> List[str]:
         """
         Apply constraints to filter candidate models.
         
@@ -175,42 +276,50 @@ class ModelSelector:
         if not constraints:
             return candidate_models
         
+        checks = self._compile_constraints(constraints)
+        models = self.model_registry.models
         filtered_candidates = []
         
         for model_name in candidate_models:
-            model_info = self.model_registry.get_model(model_name)
-            satisfies_constraints = True
-            
-            for constraint in constraints:
-                constraint_lower = constraint.lower()
-                
-                # Check for cost constraints
-                if "low cost" in constraint_lower or "budget" in constraint_lower:
-                    # Filter out expensive models
-                    if model_info.get("cost", {}).get("output_tokens", 0) > 0.00003:
-                        satisfies_constraints = False
-                        break
-                
-                # Check for performance constraints
-                if "high performance" in constraint_lower:
-                    # Require high performance models
-                    performance_values = model_info.get("performance", {}).values()
-                    if not performance_values or sum(performance_values) / len(performance_values) < 0.85:
-                        satisfies_constraints = False
-                        break
-                
-                # Check for provider constraints
-                if "provider:" in constraint_lower:
-                    provider = constraint_lower.split("provider:")[1].strip()
-                    if model_info.get("provider", "").lower() != provider:
-                        satisfies_constraints = False
-                        break
-            
-            if satisfies_constraints:
+            model_info = models[model_name]
+            if all(_CONSTRAINT_CHECKS[kind](model_info, value) for kind, value in checks):
                 filtered_candidates.append(model_name)
         
         return filtered_candidates
     
+    @staticmethod
+    def _compile_constraints(constraints: Tuple[str, ...]) -> List[Tuple[str, Any]]:
+        """
+        Parse constraints into checks once, rather than once per candidate model.
+        
+        Args:
+            constraints: The constraints to parse
+            
+        Returns:
+            A list of (check kind, check argument) pairs, keyed into _CONSTRAINT_CHECKS
+        """
+        checks = {}
+        
+        for constraint in constraints:
+            constraint_lower = constraint.lower()
+            keywords = set(_CONSTRAINT_KEYWORD_RE.findall(constraint_lower))
+            if not keywords:
+                continue
+            
+            # Check for cost constraints
+            if "low cost" in keywords or "budget" in keywords:
+                checks[("max_output_cost", _LOW_COST_MAX_OUTPUT_COST)] = None
+            
+            # Check for performance constraints
+            if "high performance" in keywords:
+                checks[("min_average_performance", _HIGH_PERFORMANCE_MIN_AVERAGE)] = None
+            
+            # Check for provider constraints
+            if "provider:" in keywords:
+                checks[("provider", constraint_lower.split("provider:")[1].strip())] = None
+        
+        return list(checks)
+    
     def _rank_models(self, candidate_models: List[str], task_type: str, requirements: List[str]) -> List[str]:
         """
         Rank candidate models based on their suitability for the task.
@@ -223,29 +332,52 @@ class ModelSelector:
         Returns:
             A list of model names sorted by their suitability (highest first)
         """
-        # Map task types to relevant performance metrics
-        task_metric_map = {
-            "system_design": ["system_design", "reasoning"],
-            "component_design": ["system_design", "reasoning"],
-            "interface_design": ["system_design", "reasoning"],
-            "analyze_requirements": ["reasoning"],
-            "implement_component": ["code_generation"],
-            "implement_interface": ["code_generation"],
-            "refactor_code": ["code_generation"],
-            "fix_bug": ["debugging", "code_generation"],
-            "test_component": ["debugging", "code_generation"],
-            "validate_interface": ["debugging", "code_generation"],
-            "performance_test": ["debugging"]
-        }
+        # Sort models by score (descending)
+        scores = self._get_scores(task_type)
+        return sorted(candidate_models, key=scores.__getitem__, reverse=True)
+    
+    def _top_model(self, candidate_models: List[str], task_type: str) -> Optional[str]:
+        """
+        Find the highest-ranked candidate model without ranking all of them.
+        
+        Args:
+            candidate_models: The list of candidate model names
+            task_type: The type of task
+            
+        Returns:
+            The first of the highest-scoring models, as _rank_models would order them, or None
+            if there are no candidates
+        """
+        if not candidate_models:
+            return None
+        
+        scores = self._get_scores(task_type)
+        return max(candidate_models, key=scores.__getitem__)
+    
+    def _get_scores(self, task_type: str) -> Dict[str, float]:
+        """
+        Get the suitability score of every registered model for a task type.
+        
+        Scores only depend on the task type and the registry, so they are computed once per
+        task type and kept until the registry changes.
+        
+        Args:
+            task_type: The type of task
+            
+        Returns:
+            A dictionary mapping model names to their scores
+        """
+        scores = self._score_table.get(task_type)
+        if scores is not None:
+            return scores
         
         # Get the relevant metrics for the task type
-        relevant_metrics = task_metric_map.get(task_type, ["reasoning"])
+        relevant_metrics = _TASK_METRICS.get(task_type, _DEFAULT_TASK_METRICS)
         
-        # Calculate a score for each candidate model
-        model_scores = []
+        # Calculate a score for each registered model
+        scores = {}
         
-        for model_name in candidate_models:
-            model_info = self.model_registry.get_model(model_name)
+        for model_name, model_info in self.model_registry.models.items():
             performance = model_info.get("performance", {})
             
             # Calculate the average performance score for relevant metrics
@@ -260,12 +392,7 @@ class ModelSelector:
                 size_factor = 1.1  # Slightly boost smaller models for efficiency
             
             # Calculate final score
-            final_score = avg_performance * size_factor
-            
-            model_scores.append((model_name, final_score))
-        
-        # Sort models by score (descending)
-        model_scores.sort(key=lambda x: x[1], reverse=True)
+            scores[model_name] = avg_performance * size_factor
         
-        # Return sorted model names
-        return [model[0] for model in model_scores]
+        self._score_table[task_type] = scores
+        return scores
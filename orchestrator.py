@@ -17,23 +17,63 @@ The Orchestrator is responsible for:
 """
 
 import asyncio
+import hashlib
+import heapq
+import inspect
+import itertools
 import json
 import logging
-import uuid
+import os
+import pickle
+import shelve
+import sys
+import time
+from collections import defaultdict
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union, Callable
-from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple, Union, Callable
+from dataclasses import asdict, dataclass, field
+
+import orjson
 
 from models import ModelRegistry, ModelSelector
 from config import config
 
 
+class StructuredLogFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects for log processing pipelines."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a log record as JSON.
+        
+        Args:
+            record: The log record to format
+            
+        Returns:
+            A JSON object with the record's time, logger, level, message, and any exception
+        """
+        entry = {
+            "timestamp": record.created,
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        
+        return orjson.dumps(entry, default=str).decode()
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+if config.get("logging.structured", False):
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(StructuredLogFormatter())
 logger = logging.getLogger("ROOcode.Orchestrator")
 
 
@@ -52,6 +92,36 @@ class Priority(Enum):
     LOW = "low"
 
 
+# Heap rank of each priority level, highest priority first
+_PRIORITY_RANK = {
+    Priority.HIGH: 0,
+    Priority.MEDIUM: 1,
+    Priority.LOW: 2
+}
+
+
+# Subtasks an "implement_system" task is broken down into, in order, as
+# (task type, stage, whether the subtask works on the main component,
+# indices of the stages it depends on)
+_IMPLEMENT_SYSTEM_STAGES = (
+    ("system_design", "design", False, ()),
+    ("implement_component", "implementation", True, (0,)),
+    ("test_component", "testing", True, (1,))
+)
+
+# Error code assumed for failures that do not report one
+_DEFAULT_ERROR_CODE = "execution_error"
+
+# Maximum number of queued responses or errors handled together by the processing loops
+_MAX_DRAIN_BATCH = 32
+
+# Default number of task results kept by the in-memory result cache
+_DEFAULT_RESULT_CACHE_SIZE = 1024
+
+# File in the cache directory that holds the orchestrator state saved on shutdown
+_STATE_FILE_NAME = "orchestrator_state.json"
+
+
 class TaskStatus(Enum):
     """Enumeration of possible task statuses."""
     SUBMITTED = "submitted"
@@ -78,11 +148,128 @@ class RecoveryStrategy(Enum):
     ROLLBACK = "rollback"
 
 
-@dataclass
+class QueueStatus(NamedTuple):
+    """A snapshot of the Orchestrator's queue sizes."""
+    task_queue: Dict[str, int]  # Queued tasks by priority
+    response_queue: int
+    status_queue: int
+    error_queue: int
+
+
+# The agent that handles each task type
+# This is a simplified mapping - in a real system, this would be more sophisticated
+_TASK_TO_AGENT = MappingProxyType({
+    # Architect tasks
+    "system_design": "architect",
+    "component_design": "architect",
+    "interface_design": "architect",
+    "analyze_requirements": "architect",
+    
+    # Coder tasks
+    "implement_component": "coder",
+    "implement_interface": "coder",
+    "refactor_code": "coder",
+    "fix_bug": "coder",
+    
+    # Debugger tasks
+    "test_component": "debugger",
+    "validate_interface": "debugger",
+    "performance_test": "debugger"
+})
+
+# Number of IDs generated from each read of the OS random source
+_UUID_BATCH_SIZE = 256
+
+
+class _UUIDPool:
+    """Generates random (version 4) UUIDs from random bytes read from the OS in bulk."""
+    
+    __slots__ = ("_buffer", "_offset")
+    
+    def __init__(self):
+        """Initialize the pool with no random bytes."""
+        self.reset()
+    
+    def reset(self) -> None:
+        """Discard any buffered random bytes."""
+        self._buffer = b""
+        self._offset = 0
+    
+    def next(self) -> str:
+        """
+        Generate a new random UUID.
+        
+        Returns:
+            The UUID in its canonical hyphenated form
+        """
+        digits = self.next_hex()
+        return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+    
+    def next_hex(self) -> str:
+        """
+        Generate a new random UUID without building a uuid.UUID object.
+        
+        Returns:
+            The UUID as 32 hex digits, without hyphens
+        """
+        if self._offset >= len(self._buffer):
+            self._buffer = os.urandom(16 * _UUID_BATCH_SIZE)
+            self._offset = 0
+        
+        raw = bytearray(self._buffer[self._offset:self._offset + 16])
+        self._offset += 16
+        raw[6] = raw[6] & 0x0F | 0x40  # Version 4
+        raw[8] = raw[8] & 0x3F | 0x80  # RFC 4122 variant
+        return raw.hex()
+
+
+_UUID_POOL = _UUIDPool()
+
+# A forked child must not hand out the same IDs as its parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_UUID_POOL.reset)
+
+# The most recent timestamp produced by _now_iso, as (epoch milliseconds, ISO-8601 string)
+_last_timestamp = (0, "")
+
+
+def _now_iso() -> str:
+    """
+    Get the current UTC time as an ISO-8601 string.
+    
+    Calls within the same millisecond share one formatted string, so a burst of messages
+    does not format the same time over and over.
+    
+    Returns:
+        The current time in ISO-8601 format
+    """
+    global _last_timestamp
+    now = time.time()
+    milliseconds = int(now * 1000)
+    if milliseconds != _last_timestamp[0]:
+        _last_timestamp = (milliseconds, datetime.fromtimestamp(now, timezone.utc).isoformat())
+    return _last_timestamp[1]
+
+
+def _format_time_ns(timestamp_ns: int) -> str:
+    """
+    Format a time in nanoseconds since the epoch as an ISO-8601 UTC string.
+    
+    Args:
+        timestamp_ns: The time, as returned by time.time_ns()
+        
+    Returns:
+        The time in ISO-8601 format, to the microsecond
+    """
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=nanoseconds // 1000).isoformat()
+
+
+@dataclass(slots=True)
 class Message:
     """Base class for all messages in the ROOcode system."""
-    message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    message_id: str = field(default_factory=_UUID_POOL.next)
+    timestamp: str = field(default_factory=_now_iso)
     sender: str = ""
     recipient: str = ""
     message_type: MessageType = MessageType.TASK
@@ -91,7 +278,7 @@ class Message:
 
     def to_json(self) -> str:
         """Convert the message to a JSON string."""
-        return json.dumps({
+        return orjson.dumps({
             "message_id": self.message_id,
             "timestamp": self.timestamp,
             "sender": self.sender,
@@ -99,15 +286,33 @@ class Message:
             "message_type": self.message_type.value,
             "priority": self.priority.value,
             "content": self.content
-        })
+        }, option=orjson.OPT_NON_STR_KEYS).decode()
 
+    def to_wire(self) -> bytes:
+        """
+        Convert the message to bytes for passing between processes.
+        
+        Unlike to_json, this keeps the message's class and any non-JSON values in its content,
+        and is cheaper for large payloads. Use to_json for logs and external consumers.
+        """
+        return pickle.dumps(self, protocol=5)
+    
+    @staticmethod
+    def from_wire(data: bytes) -> 'Message':
+        """
+        Recreate a message from bytes produced by to_wire.
+        
+        Only use this with data from trusted processes, as unpickling can run arbitrary code.
+        """
+        return pickle.loads(data)
+    
     @classmethod
     def from_json(cls, json_str: str) -> 'Message':
         """Create a Message object from a JSON string."""
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         return cls(
-            message_id=data.get("message_id", str(uuid.uuid4())),
-            timestamp=data.get("timestamp", datetime.now(timezone.utc).isoformat()),
+            message_id=data["message_id"] if "message_id" in data else _UUID_POOL.next(),
+            timestamp=data["timestamp"] if "timestamp" in data else _now_iso(),
             sender=data.get("sender", ""),
             recipient=data.get("recipient", ""),
             message_type=MessageType(data.get("message_type", "task")),
@@ -119,6 +324,8 @@ class Message:
 @dataclass
 class Task(Message):
     """Represents a task to be executed by an agent."""
+    __slots__ = ()
+    
     def __init__(self, 
                  task_id: str = None,
                  task_type: str = "",
@@ -130,8 +337,9 @@ class Task(Message):
         super().__init__(message_type=MessageType.TASK, **kwargs)
         
         # Initialize task-specific content
-        self.content["task_id"] = task_id or str(uuid.uuid4())
-        self.content["task_type"] = task_type
+        self.content["task_id"] = task_id or _UUID_POOL.next()
+        # Task types come from a small vocabulary and are looked up repeatedly when routing
+        self.content["task_type"] = sys.intern(task_type) if type(task_type) is str else task_type
         self.content["payload"] = payload or {}
         self.content["metadata"] = metadata or {}
         
@@ -141,10 +349,74 @@ class Task(Message):
         if parent_id:
             self.content["parent_id"] = parent_id
 
+    @classmethod
+    def fast_create(cls,
+                    task_id: str,
+                    task_type: str,
+                    payload: Dict[str, Any],
+                    metadata: Dict[str, Any] = None,
+                    parent_id: str = None,
+                    priority: Priority = Priority.MEDIUM,
+                    sender: str = "") -> 'Task':
+        """
+        Create a task without going through the dataclass constructor.
+        
+        The content dictionary is built in one step rather than filled in key by key, for
+        code that creates many tasks at once.
+        
+        Args:
+            task_id: The ID of the task
+            task_type: The type of task
+            payload: The task payload
+            metadata: Optional task metadata
+            parent_id: Optional ID of the workflow the task belongs to
+            priority: The priority of the task
+            sender: The sender of the task
+            
+        Returns:
+            The new task, equivalent to one created with the same arguments by the constructor
+        """
+        task = object.__new__(cls)
+        task.message_id = _UUID_POOL.next()
+        task.timestamp = _now_iso()
+        task.sender = sender
+        task.recipient = ""
+        task.message_type = MessageType.TASK
+        task.priority = priority
+        task.content = {
+            "task_id": task_id,
+            "task_type": sys.intern(task_type) if type(task_type) is str else task_type,
+            "payload": payload or {},
+            "metadata": metadata or {}
+        }
+        if parent_id:
+            task.content["parent_id"] = parent_id
+        return task
+    
+    @classmethod
+    def from_message(cls, message: Message) -> 'Task':
+        """Create a Task from a task message, sharing its payload rather than copying it via JSON."""
+        content = message.content
+        return cls(
+            task_id=content.get("task_id"),
+            task_type=content.get("task_type", ""),
+            payload=content.get("payload"),
+            metadata=content.get("metadata"),
+            deadline=content.get("deadline"),
+            parent_id=content.get("parent_id"),
+            message_id=message.message_id,
+            timestamp=message.timestamp,
+            sender=message.sender,
+            recipient=message.recipient,
+            priority=message.priority
+        )
+
 
 @dataclass
 class Response(Message):
     """Represents a response from an agent after executing a task."""
+    __slots__ = ()
+    
     def __init__(self, 
                  task_id: str,
                  status: str = "completed",
@@ -161,6 +433,8 @@ class Response(Message):
 @dataclass
 class StatusUpdate(Message):
     """Represents a status update for a task in progress."""
+    __slots__ = ()
+    
     def __init__(self, 
                  task_id: str,
                  progress: int = 0,
@@ -181,6 +455,8 @@ class StatusUpdate(Message):
 @dataclass
 class ErrorMessage(Message):
     """Represents an error that occurred during task execution."""
+    __slots__ = ()
+    
     def __init__(self, 
                  task_id: str,
                  error_code: str = "",
@@ -200,81 +476,179 @@ class ErrorMessage(Message):
         self.content["recovery_suggestion"] = recovery_suggestion
 
 
+# Error message objects free for reuse by the orchestrator's own error handling, and the
+# most that are kept
+_ERROR_MESSAGE_POOL: List[ErrorMessage] = []
+_ERROR_MESSAGE_POOL_SIZE = 256
+
+
+def _acquire_error_message(task_id: str,
+                           error_code: str,
+                           severity: ErrorSeverity,
+                           description: str,
+                           context: Dict[str, Any],
+                           recovery_suggestion: str,
+                           sender: str) -> ErrorMessage:
+    """
+    Get an error message, reusing a released one if possible.
+    
+    Args:
+        task_id: The ID of the task that failed
+        error_code: The error code
+        severity: The severity of the error
+        description: A description of the error
+        context: Context information about the error
+        recovery_suggestion: A suggested way to recover
+        sender: The sender of the message
+        
+    Returns:
+        An error message with a new message ID and timestamp and the given content
+    """
+    if not _ERROR_MESSAGE_POOL:
+        return ErrorMessage(
+            task_id=task_id,
+            error_code=error_code,
+            severity=severity,
+            description=description,
+            context=context,
+            recovery_suggestion=recovery_suggestion,
+            sender=sender
+        )
+    
+    error = _ERROR_MESSAGE_POOL.pop()
+    error.message_id = _UUID_POOL.next()
+    error.timestamp = _now_iso()
+    error.sender = sender
+    # A new content dictionary, since callbacks may have kept the previous one
+    error.content = {
+        "task_id": task_id,
+        "error_code": error_code,
+        "severity": severity.value,
+        "description": description,
+        "context": context,
+        "recovery_suggestion": recovery_suggestion
+    }
+    return error
+
+
+def _release_error_message(error: ErrorMessage) -> None:
+    """
+    Return an error message for reuse once nothing refers to it any more.
+    
+    Args:
+        error: The error message to release
+    """
+    if len(_ERROR_MESSAGE_POOL) < _ERROR_MESSAGE_POOL_SIZE:
+        error.content = {}
+        _ERROR_MESSAGE_POOL.append(error)
+
+
 class TaskQueue:
     """
     A priority queue for tasks with additional functionality for task management.
     
     This queue organizes tasks by priority and provides methods for adding, retrieving,
-    and managing tasks in the queue.
+    and managing tasks in the queue. Tasks of equal priority are retrieved longest
+    critical path first, then in the order they were added.
     """
     
     def __init__(self):
-        """Initialize the task queue with separate queues for each priority level."""
-        self._queues = {
-            Priority.HIGH: asyncio.Queue(),
-            Priority.MEDIUM: asyncio.Queue(),
-            Priority.LOW: asyncio.Queue()
-        }
-        self._task_lookup = {}  # Maps task_id to (priority, position) for quick lookups
+        """Initialize the task queue with a single heap ordered by priority and arrival."""
+        self._heap = []  # (priority rank, negated critical path length, sequence number, task) entries
+        self._sequence = itertools.count()
+        self._not_empty = asyncio.Event()
+        self._task_lookup = {}  # Maps task_id to the sequence number of its queued entry
+        self._removed = set()  # Sequence numbers of entries removed while still in the heap
     
     async def put(self, task: Task) -> None:
         """
         Add a task to the queue based on its priority.
         
+        Args:
+            task: The task to add to the queue
+        """
+        self.put_nowait(task)
+    
+    def put_nowait(self, task: Task) -> None:
+        """
+        Add a task to the queue based on its priority without awaiting.
+        
+        The queue is unbounded, so adding a task never has to wait.
+        
+        Among tasks of the same priority, those with more dependent tasks waiting behind them
+        (the "critical_path" metadata entry) are retrieved first.
+        
         Args:
             task: The task to add to the queue
         """
         priority = task.priority
-        await self._queues[priority].put(task)
-        self._task_lookup[task.content["task_id"]] = priority
-        logger.debug(f"Task {task.content['task_id']} added to {priority.value} priority queue")
+        sequence = next(self._sequence)
+        critical_path = (task.content.get("metadata") or {}).get("critical_path", 0)
+        heapq.heappush(self._heap, (_PRIORITY_RANK[priority], -critical_path, sequence, task))
+        self._task_lookup[task.content["task_id"]] = sequence
+        self._not_empty.set()
+        logger.debug("Task %s added to %s priority queue", task.content['task_id'], priority.value)
     
-    async def get(self) -> Optional[Task]:
+    async def get(self) -> Task:
         """
         Get the next task from the queue, respecting priority order.
         
+        Waits until a task is available if the queue is empty. Tasks removed with remove()
+        are skipped.
+        
         Returns:
-            The next task to process, or None if all queues are empty
+            The next task to process
         """
-        # Check queues in priority order
-        for priority in [Priority.HIGH, Priority.MEDIUM, Priority.LOW]:
-            if not self._queues[priority].empty():
-                task = await self._queues[priority].get()
-                if task.content["task_id"] in self._task_lookup:
-                    del self._task_lookup[task.content["task_id"]]
-                logger.debug(f"Task {task.content['task_id']} retrieved from {priority.value} priority queue")
-                return task
-        
-        return None
+        while True:
+            if not self._heap:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+            
+            _, _, sequence, task = heapq.heappop(self._heap)
+            if sequence in self._removed:
+                self._removed.discard(sequence)
+                continue
+            
+            task_id = task.content["task_id"]
+            if self._task_lookup.get(task_id) == sequence:
+                del self._task_lookup[task_id]
+            logger.debug("Task %s retrieved from %s priority queue", task_id, task.priority.value)
+            return task
+    
+    async def wait_for_task(self) -> None:
+        """Wait until the queue has a task to retrieve."""
+        while self.empty():
+            self._not_empty.clear()
+            await self._not_empty.wait()
     
     def empty(self) -> bool:
         """
-        Check if all queues are empty.
+        Check if the queue has no tasks left to retrieve.
         
         Returns:
-            True if all queues are empty, False otherwise
+            True if the queue is empty, False otherwise
         """
-        return all(queue.empty() for queue in self._queues.values())
+        return len(self._heap) == len(self._removed)
     
     async def remove(self, task_id: str) -> bool:
         """
         Remove a specific task from the queue.
         
+        The task's entry stays in the heap but is skipped when it reaches the front.
+        
         Args:
             task_id: The ID of the task to remove
             
         Returns:
             True if the task was found and removed, False otherwise
         """
-        if task_id not in self._task_lookup:
+        sequence = self._task_lookup.pop(task_id, None)
+        if sequence is None:
             return False
         
-        # This is a simplified implementation - in a real system, you would need
-        # to actually remove the task from the underlying queue, which is not
-        # directly supported by asyncio.Queue. A more complete implementation
-        # would use a custom queue implementation.
-        logger.debug(f"Task {task_id} marked for removal")
-        self._task_lookup[task_id] = None  # Mark as removed
+        self._removed.add(sequence)
+        logger.debug("Task %s marked for removal", task_id)
         return True
     
     def get_task_count(self) -> Dict[str, int]:
@@ -284,10 +658,25 @@ class TaskQueue:
         Returns:
             A dictionary with the count of tasks in each priority queue
         """
-        return {
-            priority.value: queue.qsize() 
-            for priority, queue in self._queues.items()
-        }
+        counts = dict.fromkeys((priority.value for priority in _PRIORITY_RANK), 0)
+        for _, _, sequence, task in self._heap:
+            if sequence not in self._removed:
+                counts[task.priority.value] += 1
+        
+        return counts
+
+
+@dataclass(slots=True)
+class _WorkflowRecord:
+    """The state of a single workflow, with times in nanoseconds since the epoch."""
+    created_at: int
+    updated_at: int
+    metadata: Dict[str, Any]
+    status: str = TaskStatus.SUBMITTED.value
+    subtasks: List[str] = field(default_factory=list)
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    pending: int = 0  # Subtasks without a result yet
+    failed: int = 0  # Subtasks whose latest result is not a successful completion
 
 
 class WorkflowState:
@@ -300,7 +689,7 @@ class WorkflowState:
     
     def __init__(self):
         """Initialize the workflow state tracker."""
-        self._workflows = {}  # workflow_id -> workflow state
+        self._workflows = {}  # workflow_id -> _WorkflowRecord
         self._task_to_workflow = {}  # task_id -> workflow_id
     
     def create_workflow(self, workflow_id: str, metadata: Dict[str, Any] = None) -> None:
@@ -314,15 +703,9 @@ class WorkflowState:
         if workflow_id in self._workflows:
             raise ValueError(f"Workflow {workflow_id} already exists")
         
-        self._workflows[workflow_id] = {
-            "status": TaskStatus.SUBMITTED.value,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-            "subtasks": [],
-            "results": {},
-            "metadata": metadata or {}
-        }
-        logger.info(f"Created new workflow: {workflow_id}")
+        now = time.time_ns()
+        self._workflows[workflow_id] = _WorkflowRecord(now, now, metadata or {})
+        logger.info("Created new workflow: %s", workflow_id)
     
     def add_task_to_workflow(self, workflow_id: str, task_id: str) -> None:
         """
@@ -335,12 +718,15 @@ class WorkflowState:
         if workflow_id not in self._workflows:
             raise ValueError(f"Workflow {workflow_id} does not exist")
         
-        self._workflows[workflow_id]["subtasks"].append(task_id)
-        self._workflows[workflow_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+        workflow = self._workflows[workflow_id]
+        workflow.subtasks.append(task_id)
+        workflow.updated_at = time.time_ns()
+        if self._task_to_workflow.get(task_id) != workflow_id and task_id not in workflow.results:
+            workflow.pending += 1
         self._task_to_workflow[task_id] = workflow_id
-        logger.debug(f"Added task {task_id} to workflow {workflow_id}")
+        logger.debug("Added task %s to workflow %s", task_id, workflow_id)
     
-    def update_task_status(self, task_id: str, status: TaskStatus, result: Dict[str, Any] = None) -> None:
+    def update_task_status(self, task_id: str, status: TaskStatus, result: Dict[str, Any] = None) -> Optional[str]:
         """
         Update the status of a task within a workflow.
         
@@ -348,25 +734,40 @@ class WorkflowState:
             task_id: The ID of the task
             status: The new status of the task
             result: Optional result data from the task
+            
+        Returns:
+            The workflow's new status if this update changed it, otherwise None
         """
         if task_id not in self._task_to_workflow:
-            logger.warning(f"Task {task_id} not associated with any workflow")
-            return
+            logger.warning("Task %s not associated with any workflow", task_id)
+            return None
         
         workflow_id = self._task_to_workflow[task_id]
-        self._workflows[workflow_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+        workflow = self._workflows[workflow_id]
+        workflow.updated_at = time.time_ns()
+        previous_status = workflow.status
         
         if result:
-            self._workflows[workflow_id]["results"][task_id] = result
+            # Keep the pending and failed counts in step with the subtask's latest result
+            previous = workflow.results.get(task_id)
+            if previous is None:
+                workflow.pending -= 1
+            elif previous.get("status") != "completed":
+                workflow.failed -= 1
+            if result.get("status") != "completed":
+                workflow.failed += 1
+            workflow.results[task_id] = result
         
         # Check if all subtasks are complete
-        if self._all_subtasks_complete(workflow_id):
-            if self._all_subtasks_successful(workflow_id):
-                self._workflows[workflow_id]["status"] = TaskStatus.COMPLETED.value
-                logger.info(f"Workflow {workflow_id} completed successfully")
+        if workflow.pending == 0:
+            if workflow.failed == 0:
+                workflow.status = TaskStatus.COMPLETED.value
+                logger.info("Workflow %s completed successfully", workflow_id)
             else:
-                self._workflows[workflow_id]["status"] = TaskStatus.FAILED.value
-                logger.warning(f"Workflow {workflow_id} failed due to subtask failures")
+                workflow.status = TaskStatus.FAILED.value
+                logger.warning("Workflow %s failed due to subtask failures", workflow_id)
+        
+        return workflow.status if workflow.status != previous_status else None
     
     def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """
@@ -376,12 +777,23 @@ class WorkflowState:
             workflow_id: The ID of the workflow
             
         Returns:
-            A dictionary containing the workflow state
+            A dictionary containing the workflow state, with its times in ISO-8601 format
         """
         if workflow_id not in self._workflows:
             raise ValueError(f"Workflow {workflow_id} does not exist")
         
-        return self._workflows[workflow_id]
+        # Times are only formatted when a caller asks for them, not on every update
+        workflow = self._workflows[workflow_id]
+        return {
+            "status": workflow.status,
+            "created_at": _format_time_ns(workflow.created_at),
+            "updated_at": _format_time_ns(workflow.updated_at),
+            "subtasks": workflow.subtasks,
+            "results": workflow.results,
+            "pending": workflow.pending,
+            "failed": workflow.failed,
+            "metadata": workflow.metadata
+        }
     
     def get_task_workflow(self, task_id: str) -> Optional[str]:
         """
@@ -395,37 +807,95 @@ class WorkflowState:
         """
         return self._task_to_workflow.get(task_id)
     
-    def _all_subtasks_complete(self, workflow_id: str) -> bool:
+    def export_state(self) -> Dict[str, Any]:
         """
-        Check if all subtasks in a workflow are complete.
+        Get the state of all workflows for saving.
         
-        Args:
-            workflow_id: The ID of the workflow
-            
         Returns:
-            True if all subtasks are complete, False otherwise
+            A dictionary of plain values that restore_state() accepts
         """
-        workflow = self._workflows[workflow_id]
-        return all(
-            task_id in workflow["results"] 
-            for task_id in workflow["subtasks"]
-        )
+        return {
+            "workflows": {workflow_id: asdict(workflow) for workflow_id, workflow in self._workflows.items()},
+            "task_to_workflow": dict(self._task_to_workflow)
+        }
     
-    def _all_subtasks_successful(self, workflow_id: str) -> bool:
+    def restore_state(self, state: Dict[str, Any]) -> List[str]:
         """
-        Check if all subtasks in a workflow completed successfully.
+        Restore workflows saved with export_state(), keeping any created since.
         
         Args:
-            workflow_id: The ID of the workflow
+            state: The saved state
             
         Returns:
-            True if all subtasks completed successfully, False otherwise
+            The IDs of the restored workflows
         """
-        workflow = self._workflows[workflow_id]
-        return all(
-            workflow["results"].get(task_id, {}).get("status") == "completed"
-            for task_id in workflow["subtasks"]
-        )
+        restored = {
+            workflow_id: _WorkflowRecord(**fields)
+            for workflow_id, fields in state["workflows"].items()
+            if workflow_id not in self._workflows
+        }
+        self._workflows.update(restored)
+        self._task_to_workflow = {**state["task_to_workflow"], **self._task_to_workflow}
+        return list(restored)
+
+
+def _decompose_implement_system(task_description: Dict[str, Any], workflow_id: str) -> List[Dict[str, Any]]:
+    """
+    Break down an "implement_system" task into design, implementation, and testing subtasks.
+    
+    Args:
+        task_description: The description of the task to break down
+        workflow_id: The ID of the workflow
+        
+    Returns:
+        A list of subtask descriptions, each depending on the one before it
+    """
+    requirements = task_description.get("requirements", [])
+    constraints = task_description.get("constraints", [])
+    parent_task = task_description.get("task_id")
+    stage_ids = [_UUID_POOL.next_hex() for _ in _IMPLEMENT_SYSTEM_STAGES]
+    return [
+        {
+            "task_id": stage_id,
+            "task_type": stage_task_type,
+            "payload": (
+                {"component_name": "main", "requirements": requirements}
+                if for_component else
+                {"requirements": requirements, "constraints": constraints}
+            ),
+            "metadata": {
+                "stage": stage,
+                "parent_task": parent_task
+            },
+            "depends_on": [stage_ids[index] for index in depends_on]
+        }
+        for stage_id, (stage_task_type, stage, for_component, depends_on)
+        in zip(stage_ids, _IMPLEMENT_SYSTEM_STAGES)
+    ]
+
+
+def _decompose_single_task(task_description: Dict[str, Any], workflow_id: str) -> List[Dict[str, Any]]:
+    """
+    Turn a task that has no decomposer of its own into a single subtask.
+    
+    Args:
+        task_description: The description of the task
+        workflow_id: The ID of the workflow
+        
+    Returns:
+        A list holding the one subtask description
+    """
+    return [
+        {
+            "task_id": _UUID_POOL.next_hex(),
+            "task_type": task_description.get("task_type", ""),
+            "payload": task_description.get("payload", {}),
+            "metadata": {
+                "parent_task": task_description.get("task_id")
+            },
+            "depends_on": []
+        }
+    ]
 
 
 class Orchestrator:
@@ -442,7 +912,7 @@ class Orchestrator:
         self.task_queue = TaskQueue()
         self.workflow_state = WorkflowState()
         
-        # Communication channels (queues)
+        # Communication channels (queues) for messages from agents and other producers
         self.response_queue = asyncio.Queue()
         self.status_queue = asyncio.Queue()
         self.error_queue = asyncio.Queue()
@@ -454,25 +924,69 @@ class Orchestrator:
             'debugger': None
         }
         
+        # Limit on the number of tasks executed at once
+        self._dispatch_semaphore = asyncio.Semaphore(config.get("orchestrator.max_concurrent_tasks", 5))
+        
         # Error handling configuration
         self.max_retries = 3
         self.retry_delays = [5, 15, 30]  # Seconds to wait before retry attempts
+        self._recovery_table = self._build_recovery_table(
+            config.get("orchestrator.recovery_rules", {})
+        )
+        
+        # Functions that break tasks down into subtasks, by task type
+        self._decomposers = {"implement_system": _decompose_implement_system}
         
-        # Callback registry for event handling
+        # Callback registry for event handling; tuples, so dispatch never sees a list being changed
         self.callbacks = {
-            'on_task_complete': [],
-            'on_task_failed': [],
-            'on_workflow_complete': [],
-            'on_workflow_failed': [],
-            'on_error': []
+            'on_task_complete': (),
+            'on_task_failed': (),
+            'on_workflow_complete': (),
+            'on_workflow_failed': (),
+            'on_error': ()
         }
+        # The same callbacks paired with whether each is a coroutine function, so dispatch
+        # does not need to check
+        self._callback_entries = {event_type: () for event_type in self.callbacks}
+        self._callback_tasks = set()  # Running asynchronous callbacks
         
         # Initialize model registry and selector
         default_model = config.get("model.default", "Claude-3.7-Sonnet")
         self.model_registry = ModelRegistry(default_model=default_model)
         self.model_selector = ModelSelector(self.model_registry)
+        self._auto_select_model = bool(config.get("model.auto_select", True))
+        
+        # Results of successful tasks by fingerprint, so resubmitted unchanged tasks are not re-run.
+        # Off unless enabled: a task's payload does not always capture everything its result
+        # depends on (test_component, for one, does not carry the code under test). The cache
+        # is kept on disk when a cache directory is configured, and in memory up to
+        # cache.max_results entries otherwise.
+        cache_dir = config.get("cache.dir")
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        if not config.get("cache.results", False):
+            self._result_cache = None
+        elif cache_dir:
+            self._result_cache = shelve.open(os.path.join(cache_dir, "task_results"))
+        else:
+            self._result_cache = {}
+        self._result_cache_size = config.get("cache.max_results", _DEFAULT_RESULT_CACHE_SIZE)
         
-        logger.info(f"Orchestrator initialized with default model: {default_model}")
+        # Workflow state, retry counts, and unfinished tasks are saved to the cache directory
+        # on shutdown and restored here
+        self._state_path = os.path.join(cache_dir, _STATE_FILE_NAME) if cache_dir else None
+        self._task_fingerprints = {}  # task_id -> fingerprint, for tasks awaiting a result
+        self._original_tasks = {}  # task_id -> submitted task, kept for retries until it succeeds or is given up on
+        self._retry_counts = defaultdict(int)  # task_id -> retries made so far
+        
+        # Subtasks held back until the subtasks they depend on have completed
+        self._blocked_tasks = {}  # task_id -> (task, IDs of dependencies not yet completed)
+        self._dependents = defaultdict(list)  # task_id -> IDs of blocked tasks waiting on it
+        
+        if self._state_path:
+            self._load_state()
+        
+        logger.info("Orchestrator initialized with default model: %s", default_model)
     
     def register_agent(self, agent_type: str, agent_instance: Any) -> None:
         """
@@ -484,9 +998,9 @@ class Orchestrator:
         """
         if agent_type not in self.agents:
             self.agents[agent_type] = agent_instance
-            logger.info(f"Registered agent: {agent_type}")
+            logger.info("Registered agent: %s", agent_type)
         else:
-            logger.warning(f"Agent type {agent_type} already registered, replacing")
+            logger.warning("Agent type %s already registered, replacing", agent_type)
             self.agents[agent_type] = agent_instance
     
     def register_callback(self, event_type: str, callback: Callable) -> None:
@@ -495,84 +1009,347 @@ class Orchestrator:
         
         Args:
             event_type: The type of event to register for
-            callback: The function to call when the event occurs
+            callback: The function to call when the event occurs; it may be a coroutine function.
+                on_task_complete callbacks receive the task ID and the task's result, with its
+                outcome under "status" (for results reported in a response, the response's
+                own result is under "result")
         """
         if event_type in self.callbacks:
-            self.callbacks[event_type].append(callback)
-            logger.debug(f"Registered callback for event: {event_type}")
+            self.callbacks[event_type] += (callback,)
+            self._callback_entries[event_type] += ((callback, inspect.iscoroutinefunction(callback)),)
+            logger.debug("Registered callback for event: %s", event_type)
         else:
-            logger.warning(f"Unknown event type: {event_type}")
+            logger.warning("Unknown event type: %s", event_type)
+    
+    def register_decomposer(self, task_type: str, decomposer: Callable) -> None:
+        """
+        Register the function that breaks down tasks of a given type into subtasks.
+        
+        Args:
+            task_type: The type of task the decomposer handles
+            decomposer: A function taking the task description and workflow ID and returning
+                a list of subtask descriptions, each with "task_id", "task_type", "payload",
+                and optionally "metadata" and "depends_on" (IDs of subtasks it waits for)
+        """
+        if task_type in self._decomposers:
+            logger.warning("Decomposer for task type %s already registered, replacing", task_type)
+        else:
+            logger.debug("Registered decomposer for task type: %s", task_type)
+        self._decomposers[task_type] = decomposer
+    
+    def _schedule_callbacks(self, event_type: str, *args: Any) -> None:
+        """
+        Schedule the callbacks registered for an event to run once the caller yields.
+        
+        Synchronous callbacks run in registration order via the event loop; asynchronous
+        callbacks run as tasks. Either way the caller carries on without waiting for them.
+        
+        Args:
+            event_type: The type of event that occurred
+            *args: The arguments to pass to each callback
+        """
+        entries = self._callback_entries[event_type]
+        if not entries:
+            return
+        
+        loop = asyncio.get_running_loop()
+        for callback, is_coroutine_function in entries:
+            if is_coroutine_function:
+                callback_task = loop.create_task(callback(*args))
+                self._callback_tasks.add(callback_task)
+                callback_task.add_done_callback(self._finish_callback_task)
+            else:
+                loop.call_soon(self._run_callback, callback, args)
+    
+    @staticmethod
+    def _run_callback(callback: Callable, args: Tuple[Any, ...]) -> None:
+        """
+        Run a synchronous callback, logging any error it raises.
+        
+        Args:
+            callback: The callback to run
+            args: The arguments to pass to it
+        """
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error("Error in callback: %s", e)
+    
+    def _finish_callback_task(self, callback_task: asyncio.Task) -> None:
+        """
+        Clean up after an asynchronous callback, logging any error it raised.
+        
+        Args:
+            callback_task: The finished callback task
+        """
+        self._callback_tasks.discard(callback_task)
+        if not callback_task.cancelled() and callback_task.exception() is not None:
+            logger.error("Error in callback: %s", callback_task.exception())
     
     async def submit_task(self, task_description: Dict[str, Any], priority: Priority = Priority.MEDIUM) -> str:
         """
         Submit a new task to the Orchestrator.
         
         Args:
-            task_description: A dictionary describing the task
+            task_description: A dictionary describing the task; "use_cache": False makes its
+                subtasks run even when the result cache has a result for them
             priority: The priority level for the task
             
         Returns:
             The ID of the created workflow
+            
+        Raises:
+            ValueError: If the subtasks the task breaks down into have invalid dependencies
         """
         # Generate IDs
-        workflow_id = str(uuid.uuid4())
+        workflow_id = _UUID_POOL.next()
+        
+        # Break down the task into subtasks, checking their dependencies before anything is
+        # recorded for the workflow
+        subtasks = self._break_down_task(task_description, workflow_id)
+        critical_paths = self._critical_path_lengths(subtasks)
         
         # Create workflow
         self.workflow_state.create_workflow(workflow_id, metadata=task_description.get("metadata"))
         
-        # Break down the task into subtasks
-        subtasks = self._break_down_task(task_description, workflow_id)
+        # Add all subtasks to the workflow first, so a cached result cannot complete it early
+        for subtask in subtasks:
+            self.workflow_state.add_task_to_workflow(workflow_id, subtask["task_id"])
         
-        # Add subtasks to the workflow and queue
+        # Hold back subtasks with dependencies until those complete, and queue the rest
+        # once all are registered, so a cached result cannot release a dependent early
+        use_cache = task_description.get("use_cache", True)
+        ready_tasks = []
         for subtask in subtasks:
-            task = Task(
-                task_id=subtask["task_id"],
-                task_type=subtask["task_type"],
-                payload=subtask["payload"],
-                metadata=subtask.get("metadata"),
+            task_id = subtask["task_id"]
+            task = Task.fast_create(
+                task_id,
+                subtask["task_type"],
+                subtask["payload"],
+                metadata=dict(
+                    subtask.get("metadata") or {},
+                    critical_path=critical_paths[task_id],
+                    use_cache=use_cache
+                ),
                 parent_id=workflow_id,
                 priority=priority,
                 sender="orchestrator"
             )
             
-            self.workflow_state.add_task_to_workflow(workflow_id, subtask["task_id"])
-            await self.task_queue.put(task)
+            depends_on = subtask.get("depends_on")
+            if depends_on:
+                self._blocked_tasks[task_id] = (task, set(depends_on))
+                for dependency_id in depends_on:
+                    self._dependents[dependency_id].append(task_id)
+            else:
+                ready_tasks.append(task)
+        
+        for task in ready_tasks:
+            await self._enqueue_task(task)
         
-        logger.info(f"Submitted new workflow {workflow_id} with {len(subtasks)} subtasks")
+        logger.info("Submitted new workflow %s with %s subtasks", workflow_id, len(subtasks))
         return workflow_id
     
+    @staticmethod
+    def _critical_path_lengths(subtasks: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Check the dependencies between subtasks and compute the length of the longest
+        dependency chain starting at each one.
+        
+        Args:
+            subtasks: Subtask descriptions, each listing the IDs it waits for under "depends_on"
+            
+        Returns:
+            A dictionary mapping each subtask ID to the number of subtasks on the longest
+            chain from it through the subtasks that depend on it, itself included
+            
+        Raises:
+            ValueError: If subtask IDs repeat, a subtask depends on an ID that is not one of
+                the subtasks, or the dependencies form a cycle
+        """
+        dependents = {}
+        for subtask in subtasks:
+            if subtask["task_id"] in dependents:
+                raise ValueError(f"Duplicate subtask ID: {subtask['task_id']}")
+            dependents[subtask["task_id"]] = []
+        
+        waiting_counts = {}
+        for subtask in subtasks:
+            task_id = subtask["task_id"]
+            depends_on = subtask.get("depends_on") or ()
+            for dependency_id in depends_on:
+                if dependency_id not in dependents:
+                    raise ValueError(f"Subtask {task_id} depends on unknown subtask {dependency_id}")
+                dependents[dependency_id].append(task_id)
+            waiting_counts[task_id] = len(depends_on)
+        
+        # Order the subtasks so each comes after everything it depends on (Kahn's algorithm);
+        # subtasks left out of the order are on a cycle
+        order = [task_id for task_id, count in waiting_counts.items() if count == 0]
+        for task_id in order:
+            for dependent_id in dependents[task_id]:
+                waiting_counts[dependent_id] -= 1
+                if waiting_counts[dependent_id] == 0:
+                    order.append(dependent_id)
+        
+        if len(order) != len(dependents):
+            raise ValueError("Subtask dependencies form a cycle")
+        
+        # Walk the order backwards so each subtask's dependents already have their lengths
+        lengths = {}
+        for task_id in reversed(order):
+            lengths[task_id] = 1 + max((lengths[dependent_id] for dependent_id in dependents[task_id]), default=0)
+        return lengths
+    
+    async def _enqueue_task(self, task: Task) -> None:
+        """
+        Queue a task whose dependencies have completed, or complete it from the result cache.
+        
+        Args:
+            task: The task to queue
+        """
+        content = task.content
+        task_id = content["task_id"]
+        result_cache = self._result_cache
+        if result_cache is not None:
+            fingerprint = self._task_fingerprint(content["task_type"], content["payload"], self._select_model(content))
+            
+            # Tasks submitted with "use_cache": False still refresh the cache, but never read it
+            if content["metadata"].get("use_cache", True):
+                cached_result = result_cache.get(fingerprint)
+                if cached_result is not None:
+                    logger.info("Reusing cached result for task %s", task_id)
+                    await self._handle_result(task, cached_result)
+                    return
+            
+            self._task_fingerprints[task_id] = fingerprint
+        
+        self._original_tasks[task_id] = task
+        await self.task_queue.put(task)
+    
+    async def _release_dependents(self, task_id: str) -> None:
+        """
+        Queue the blocked tasks that were only waiting on a completed task.
+        
+        Args:
+            task_id: The ID of the completed task
+        """
+        for dependent_id in self._dependents.pop(task_id, ()):
+            blocked = self._blocked_tasks.get(dependent_id)
+            if blocked is None:
+                continue
+            
+            task, remaining = blocked
+            remaining.discard(task_id)
+            if not remaining:
+                del self._blocked_tasks[dependent_id]
+                await self._enqueue_task(task)
+    
+    def _skip_dependents(self, task_id: str) -> None:
+        """
+        Fail the blocked tasks that depend, directly or not, on a task that did not complete.
+        
+        Args:
+            task_id: The ID of the task that did not complete
+        """
+        pending = self._dependents.pop(task_id, [])
+        while pending:
+            dependent_id = pending.pop()
+            if self._blocked_tasks.pop(dependent_id, None) is None:
+                continue
+            
+            logger.warning("Skipping task %s: a task it depends on did not complete", dependent_id)
+            self.workflow_state.update_task_status(
+                dependent_id,
+                TaskStatus.FAILED,
+                {"status": "failed", "error": f"Dependency {task_id} did not complete"}
+            )
+            pending.extend(self._dependents.pop(dependent_id, ()))
+    
+    def _task_fingerprint(self, task_type: str, payload: Dict[str, Any], model: str) -> str:
+        """
+        Compute the result cache key for a task.
+        
+        Args:
+            task_type: The type of task
+            payload: The task payload
+            model: The model the task would run with
+            
+        Returns:
+            A hex digest of the task type, payload, model, and the class and version of the
+            agent that handles the task, so changing the model or replacing or upgrading an
+            agent invalidates its results
+        """
+        agent = self.agents.get(self._determine_agent_type(task_type))
+        agent_key = None if agent is None else (type(agent).__qualname__, getattr(agent, "version", None))
+        key = json.dumps({"t": task_type, "p": payload, "m": model, "a": agent_key}, sort_keys=True, default=str)
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    
     async def process_tasks(self) -> None:
         """
         Process tasks from the queue until it's empty.
         
         This method continuously retrieves tasks from the queue and delegates them
-        to the appropriate agents for execution.
+        to the appropriate agents for execution. Up to max_concurrent_tasks tasks run
+        at once; the next task is only taken from the queue when a slot is free, so
+        higher-priority tasks queued in the meantime are dispatched first. Tasks queued
+        by running tasks, such as retries, are processed before this method returns.
+        """
+        task_queue = self.task_queue
+        dispatch_semaphore = self._dispatch_semaphore
+        in_flight = set()
+        
+        async with asyncio.TaskGroup() as task_group:
+            while True:
+                if task_queue.empty():
+                    if not in_flight:
+                        break
+                    # Running tasks may queue retries, so wait for one before checking again
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                
+                await dispatch_semaphore.acquire()
+                if task_queue.empty():
+                    dispatch_semaphore.release()
+                    continue
+                
+                dispatch = task_group.create_task(self._dispatch_task(await task_queue.get()))
+                in_flight.add(dispatch)
+                dispatch.add_done_callback(in_flight.discard)
+    
+    async def _dispatch_task(self, task: Task) -> None:
         """
-        while not self.task_queue.empty():
-            # Get the next task
-            task = await self.task_queue.get()
-            if not task:
-                continue
-            
-            task_id = task.content["task_id"]
-            task_type = task.content["task_type"]
+        Execute a task with the appropriate agent and handle its outcome.
+        
+        The caller must hold a dispatch semaphore slot, which is released when the task is done.
+        
+        Args:
+            task: The task to execute
+        """
+        try:
+            content = task.content
+            task_id = content["task_id"]
+            task_type = content["task_type"]
             
             # Determine which agent should handle this task
             agent_type = self._determine_agent_type(task_type)
-            if not agent_type or agent_type not in self.agents or not self.agents[agent_type]:
+            agent = self.agents.get(agent_type) if agent_type else None
+            if not agent:
                 error_msg = f"No agent available to handle task type: {task_type}"
                 logger.error(error_msg)
                 await self._handle_error(task, error_msg)
-                continue
+                return
             
             # Execute the task
             try:
-                logger.info(f"Executing task {task_id} of type {task_type} with agent {agent_type}")
-                result = await self._execute_task(self.agents[agent_type], task)
+                logger.info("Executing task %s of type %s with agent %s", task_id, task_type, agent_type)
+                result = await self._execute_task(agent, task)
                 await self._handle_result(task, result)
             except Exception as e:
-                logger.error(f"Error executing task {task_id}: {str(e)}")
+                logger.error("Error executing task %s: %s", task_id, e)
                 await self._handle_error(task, str(e))
+        finally:
+            self._dispatch_semaphore.release()
     
     async def run(self) -> None:
         """
@@ -594,24 +1371,40 @@ class Orchestrator:
     async def _process_task_loop(self) -> None:
         """Process tasks from the queue in a continuous loop."""
         while True:
+            await self.task_queue.wait_for_task()
             await self.process_tasks()
-            await asyncio.sleep(0.1)  # Small delay to prevent CPU spinning
     
     async def _process_response_loop(self) -> None:
         """Process responses from agents in a continuous loop."""
         while True:
-            if not self.response_queue.empty():
-                response = await self.response_queue.get()
-                await self._handle_response(response)
-            await asyncio.sleep(0.1)
+            responses = await self._drain_queue(self.response_queue)
+            await asyncio.gather(*(self._handle_response(response) for response in responses))
     
     async def _process_error_loop(self) -> None:
         """Process errors in a continuous loop."""
         while True:
-            if not self.error_queue.empty():
-                error = await self.error_queue.get()
-                await self._handle_error_message(error)
-            await asyncio.sleep(0.1)
+            errors = await self._drain_queue(self.error_queue)
+            await asyncio.gather(*(self._handle_error_message(error) for error in errors))
+    
+    @staticmethod
+    async def _drain_queue(queue: asyncio.Queue) -> List[Any]:
+        """
+        Wait for an item on a queue, then take any further items that are already waiting.
+        
+        Args:
+            queue: The queue to drain
+            
+        Returns:
+            Between one and _MAX_DRAIN_BATCH items, in queue order
+        """
+        items = [await queue.get()]
+        while len(items) < _MAX_DRAIN_BATCH:
+            try:
+                items.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        
+        return items
     
     async def _execute_task(self, agent: Any, task: Task) -> Dict[str, Any]:
         """
@@ -624,34 +1417,50 @@ class Orchestrator:
         Returns:
             The result of the task execution
         """
-        # Select the appropriate model for this task
-        task_dict = {
-            "task_type": task.content.get("task_type", ""),
-            "requirements": task.content.get("payload", {}).get("requirements", []),
-            "constraints": task.content.get("payload", {}).get("constraints", []),
-        }
+        content = task.content
+        payload = content.get("payload")
+        if payload is None:
+            payload = content["payload"] = {}
         
-        # Check if a specific model is requested in the task
-        if "model" in task.content:
-            task_dict["model"] = task.content["model"]
-        
-        # Use auto-selection if enabled in config, otherwise use default model
-        if config.get("model.auto_select", True):
-            selected_model = self.model_selector.select_model(task_dict)
-        else:
-            selected_model = self.model_registry.default_model
+        selected_model = self._select_model(content)
         
         # Add the selected model to the task payload
-        if "payload" not in task.content:
-            task.content["payload"] = {}
-        
-        task.content["payload"]["model"] = selected_model
+        payload["model"] = selected_model
         
-        logger.info(f"Executing task {task.content['task_id']} with model: {selected_model}")
+        logger.info("Executing task %s with model: %s", content['task_id'], selected_model)
         
         # Execute the task with the selected model
         return await agent.execute_task(task)
     
+    def _select_model(self, content: Dict[str, Any]) -> str:
+        """
+        Choose the model a task runs with.
+        
+        Args:
+            content: The task content
+            
+        Returns:
+            The name of the selected model
+        """
+        payload = content.get("payload") or {}
+        
+        # Use auto-selection if enabled in config, otherwise use default model
+        if self._auto_select_model:
+            # Select the appropriate model for this task
+            task_dict = {
+                "task_type": content.get("task_type", ""),
+                "requirements": payload.get("requirements", []),
+                "constraints": payload.get("constraints", []),
+            }
+            
+            # Check if a specific model is requested in the task
+            if "model" in content:
+                task_dict["model"] = content["model"]
+            
+            return self.model_selector.select_model(task_dict)
+        
+        return self.model_registry.default_model
+    
     async def _handle_result(self, task: Task, result: Dict[str, Any]) -> None:
         """
         Handle the result of a completed task.
@@ -660,59 +1469,99 @@ class Orchestrator:
             task: The task that was executed
             result: The result of the task execution
         """
-        task_id = task.content["task_id"]
-        workflow_id = task.content.get("parent_id")
+        content = task.content
+        await self._complete_task(content["task_id"], content.get("parent_id"), result)
+    
+    async def _complete_task(self, task_id: str, workflow_id: Optional[str], result: Dict[str, Any]) -> None:
+        """
+        Record the final result of a task and start the tasks waiting on it.
+        
+        Args:
+            task_id: The ID of the task
+            workflow_id: The ID of the task's workflow, or None if it has none
+            result: The result of the task, with its outcome under "status"
+        """
+        fingerprint = self._task_fingerprints.pop(task_id, None)
+        self._original_tasks.pop(task_id, None)
+        self._retry_counts.pop(task_id, None)
         
         if not workflow_id:
-            logger.warning(f"Task {task_id} has no associated workflow")
+            logger.warning("Task %s has no associated workflow", task_id)
             return
         
-        # Update workflow state
-        self.workflow_state.update_task_status(
+        # Remember successful results for identical tasks submitted later. The disk cache is
+        # flushed when it is closed on shutdown rather than after every write.
+        if fingerprint is not None and result.get("status") == "completed":
+            result_cache = self._result_cache
+            if type(result_cache) is dict and len(result_cache) >= self._result_cache_size:
+                # Evict the oldest entry
+                del result_cache[next(iter(result_cache))]
+            result_cache[fingerprint] = result
+        
+        # Update workflow state, noting whether this result completes the workflow before any
+        # callback gives other tasks a chance to complete it too
+        workflow_state = self.workflow_state
+        workflow_status = workflow_state.update_task_status(
             task_id, 
             TaskStatus.COMPLETED, 
             result
         )
+        workflow_completed = workflow_status == TaskStatus.COMPLETED.value
         
         # Check if this completion triggers any callbacks
-        for callback in self.callbacks['on_task_complete']:
-            callback(task_id, result)
+        self._schedule_callbacks('on_task_complete', task_id, result)
         
         # Check if the workflow is complete
-        workflow_status = self.workflow_state.get_workflow_status(workflow_id)
-        if workflow_status["status"] == TaskStatus.COMPLETED.value:
-            logger.info(f"Workflow {workflow_id} completed")
-            for callback in self.callbacks['on_workflow_complete']:
-                callback(workflow_id, workflow_status)
+        if workflow_completed:
+            logger.info("Workflow %s completed", workflow_id)
+            self._schedule_callbacks(
+                'on_workflow_complete', workflow_id, workflow_state.get_workflow_status(workflow_id)
+            )
+        
+        # Start the tasks that were waiting on this one, unless it did not succeed
+        if result.get("status") == "completed":
+            await self._release_dependents(task_id)
+        else:
+            self._skip_dependents(task_id)
     
     async def _handle_response(self, response: Response) -> None:
         """
         Handle a response message from an agent.
         
+        The response's result is wrapped as {"status": ..., "result": ...}, the shape agents
+        return from execute_task, before it is stored in the workflow and passed to the
+        on_task_complete or on_task_failed callbacks, so a result reported in a response looks
+        the same as one returned directly.
+        
         Args:
             response: The response message
         """
-        task_id = response.content["task_id"]
-        status = response.content["status"]
-        result = response.content.get("result", {})
+        content = response.content
+        task_id = content["task_id"]
+        status = content["status"]
+        result = content.get("result", {})
         
-        workflow_id = self.workflow_state.get_task_workflow(task_id)
+        workflow_state = self.workflow_state
+        workflow_id = workflow_state.get_task_workflow(task_id)
         if not workflow_id:
-            logger.warning(f"Response for unknown task: {task_id}")
+            logger.warning("Response for unknown task: %s", task_id)
             return
         
+        # The response settles this attempt, so the task should not also run from the queue
+        await self.task_queue.remove(task_id)
+        
+        task_result = {"status": status, "result": result}
         if status == "completed":
-            self.workflow_state.update_task_status(task_id, TaskStatus.COMPLETED, result)
-            for callback in self.callbacks['on_task_complete']:
-                callback(task_id, result)
+            # Finish the task as if its agent had returned the result directly
+            await self._complete_task(task_id, workflow_id, task_result)
         elif status == "failed":
-            self.workflow_state.update_task_status(task_id, TaskStatus.FAILED, result)
-            for callback in self.callbacks['on_task_failed']:
-                callback(task_id, result)
+            self._task_fingerprints.pop(task_id, None)
+            workflow_state.update_task_status(task_id, TaskStatus.FAILED, task_result)
+            self._schedule_callbacks('on_task_failed', task_id, task_result)
             
-            # Determine recovery strategy
-            recovery_strategy = self._determine_recovery_strategy(task_id, result)
-            await self._apply_recovery_strategy(task_id, recovery_strategy, result)
+            # Determine recovery strategy from the agent's own error details
+            recovery_strategy = self._determine_recovery_strategy(task_id, workflow_id, result)
+            await self._apply_recovery_strategy(task_id, workflow_id, recovery_strategy, result)
     
     async def _handle_error(self, task: Task, error_message: str) -> None:
         """
@@ -722,41 +1571,47 @@ class Orchestrator:
             task: The task that failed
             error_message: The error message
         """
-        task_id = task.content["task_id"]
-        workflow_id = task.content.get("parent_id")
+        content = task.content
+        task_id = content["task_id"]
+        workflow_id = content.get("parent_id")
+        self._task_fingerprints.pop(task_id, None)
         
         if not workflow_id:
-            logger.warning(f"Task {task_id} has no associated workflow")
+            logger.warning("Task %s has no associated workflow", task_id)
             return
         
         # Create an error message
-        error = ErrorMessage(
+        error = _acquire_error_message(
             task_id=task_id,
             error_code="execution_error",
             severity=ErrorSeverity.WARNING,
             description=error_message,
-            context={"task": task.content},
+            context={"task": content},
             recovery_suggestion="Retry the task",
             sender="orchestrator"
         )
         
-        # Add to error queue
-        await self.error_queue.put(error)
+        # Handle the error directly; the error queue is only for errors reported from outside
+        # the orchestrator's own processing. The message itself is not passed on, so it can
+        # be reused afterwards.
+        await self._handle_error_message(error)
+        _release_error_message(error)
         
         # Update workflow state
+        error_info = {"error": error_message}
         self.workflow_state.update_task_status(
             task_id, 
             TaskStatus.FAILED, 
-            {"error": error_message}
+            error_info
         )
         
         # Trigger callbacks
-        for callback in self.callbacks['on_task_failed']:
-            callback(task_id, {"error": error_message})
+        self._schedule_callbacks('on_task_failed', task_id, error_info)
         
-        # Determine and apply recovery strategy
-        recovery_strategy = self._determine_recovery_strategy(task_id, {"error": error_message})
-        await self._apply_recovery_strategy(task_id, recovery_strategy, {"error": error_message})
+        # Determine and apply recovery strategy, looking up the task's workflow only once
+        task_workflow_id = self.workflow_state.get_task_workflow(task_id)
+        recovery_strategy = self._determine_recovery_strategy(task_id, task_workflow_id, error_info)
+        await self._apply_recovery_strategy(task_id, task_workflow_id, recovery_strategy, error_info)
     
     async def _handle_error_message(self, error: ErrorMessage) -> None:
         """
@@ -765,21 +1620,21 @@ class Orchestrator:
         Args:
             error: The error message
         """
-        task_id = error.content["task_id"]
-        severity = error.content["severity"]
-        description = error.content["description"]
+        content = error.content
+        task_id = content["task_id"]
+        severity = content["severity"]
+        description = content["description"]
         
-        logger.error(f"Error in task {task_id}: {description} (Severity: {severity})")
+        logger.error("Error in task %s: %s (Severity: %s)", task_id, description, severity)
         
         # Trigger callbacks
-        for callback in self.callbacks['on_error']:
-            callback(task_id, error.content)
+        self._schedule_callbacks('on_error', task_id, content)
         
         # For critical errors, we might want to take special action
         if severity == ErrorSeverity.CRITICAL.value:
             workflow_id = self.workflow_state.get_task_workflow(task_id)
             if workflow_id:
-                logger.critical(f"Critical error in workflow {workflow_id}, escalating")
+                logger.critical("Critical error in workflow %s, escalating", workflow_id)
                 # Implement escalation logic here
     
     def _determine_agent_type(self, task_type: str) -> Optional[str]:
@@ -792,181 +1647,129 @@ class Orchestrator:
         Returns:
             The type of agent that should handle the task, or None if no agent is suitable
         """
-        # This is a simplified mapping - in a real system, this would be more sophisticated
-        task_to_agent_mapping = {
-            # Architect tasks
-            "system_design": "architect",
-            "component_design": "architect",
-            "interface_design": "architect",
-            "analyze_requirements": "architect",
-            
-            # Coder tasks
-            "implement_component": "coder",
-            "implement_interface": "coder",
-            "refactor_code": "coder",
-            "fix_bug": "coder",
-            
-            # Debugger tasks
-            "test_component": "debugger",
-            "validate_interface": "debugger",
-            "performance_test": "debugger"
-        }
-        
-        return task_to_agent_mapping.get(task_type)
+        return _TASK_TO_AGENT.get(task_type)
     
-    def _determine_recovery_strategy(self, task_id: str, error_info: Dict[str, Any]) -> RecoveryStrategy:
+    def _determine_recovery_strategy(self, task_id: str, workflow_id: Optional[str], error_info: Dict[str, Any]) -> RecoveryStrategy:
         """
         Determine the appropriate recovery strategy for a failed task.
         
         Args:
             task_id: The ID of the failed task
+            workflow_id: The ID of the task's workflow, or None if it has none
             error_info: Information about the error
             
         Returns:
             The recovery strategy to apply
         """
-        # This is a simplified implementation - in a real system, this would be more sophisticated
-        # and would take into account the nature of the error, the task type, and the workflow state
-        
-        # Get retry count from workflow state
-        workflow_id = self.workflow_state.get_task_workflow(task_id)
         if not workflow_id:
             return RecoveryStrategy.ESCALATE
         
-        workflow = self.workflow_state.get_workflow_status(workflow_id)
-        retry_count = workflow.get("metadata", {}).get("retry_count", {}).get(task_id, 0)
+        retry_count = self._retry_counts.get(task_id, 0)
         
-        # Check if we've exceeded max retries
-        if retry_count >= self.max_retries:
-            # If we've tried retrying too many times, try decomposing the task
-            return RecoveryStrategy.DECOMPOSE
+        # Look up the strategy for this error and attempt, falling back to the rules for
+        # generic execution errors
+        key = (error_info.get("error_code", _DEFAULT_ERROR_CODE), min(retry_count, self.max_retries))
+        strategy = self._recovery_table.get(key)
+        if strategy is None:
+            strategy = self._recovery_table[(_DEFAULT_ERROR_CODE, key[1])]
         
-        # Otherwise, retry the task
-        return RecoveryStrategy.RETRY
+        return strategy
     
-    async def _apply_recovery_strategy(self, task_id: str, strategy: RecoveryStrategy, error_info: Dict[str, Any]) -> None:
+    def _build_recovery_table(self, recovery_rules: Dict[str, List[str]]) -> Dict[Tuple[str, int], RecoveryStrategy]:
+        """
+        Build the recovery strategy lookup table.
+        
+        By default, a failed task is retried until it has been retried max_retries times,
+        and then decomposed.
+        
+        Args:
+            recovery_rules: Recovery strategy names by error code, one per retry count
+                already made; the last applies to all further attempts
+            
+        Returns:
+            The recovery strategy for each (error code, retry count) pair, with retry counts
+            capped at max_retries
+        """
+        default_rules = [RecoveryStrategy.RETRY.value] * self.max_retries + [RecoveryStrategy.DECOMPOSE.value]
+        rules = {_DEFAULT_ERROR_CODE: default_rules, **recovery_rules}
+        
+        table = {}
+        for error_code, strategies in rules.items():
+            for attempt in range(self.max_retries + 1):
+                strategy = strategies[min(attempt, len(strategies) - 1)]
+                table[(error_code, attempt)] = RecoveryStrategy(strategy)
+        
+        return table
+    
+    async def _apply_recovery_strategy(self,
+                                       task_id: str,
+                                       workflow_id: Optional[str],
+                                       strategy: RecoveryStrategy,
+                                       error_info: Dict[str, Any]) -> None:
         """
         Apply a recovery strategy to a failed task.
         
         Args:
             task_id: The ID of the failed task
+            workflow_id: The ID of the task's workflow, or None if it has none
             strategy: The recovery strategy to apply
             error_info: Information about the error
         """
-        workflow_id = self.workflow_state.get_task_workflow(task_id)
         if not workflow_id:
-            logger.warning(f"Cannot apply recovery strategy for task {task_id}: no associated workflow")
+            logger.warning("Cannot apply recovery strategy for task %s: no associated workflow", task_id)
             return
         
-        workflow = self.workflow_state.get_workflow_status(workflow_id)
-        
         if strategy == RecoveryStrategy.RETRY:
-            # Increment retry count
-            retry_count = workflow.get("metadata", {}).get("retry_count", {}).get(task_id, 0)
-            if "retry_count" not in workflow.get("metadata", {}):
-                workflow["metadata"]["retry_count"] = {}
-            workflow["metadata"]["retry_count"][task_id] = retry_count + 1
-            
             # Get the original task and requeue it
-            original_task = None
-            for subtask_id in workflow["subtasks"]:
-                if subtask_id == task_id:
-                    # Recreate the task - in a real implementation, we would store the original task
-                    original_task = Task(
-                        task_id=task_id,
-                        task_type=workflow["metadata"].get("task_type", "unknown"),
-                        payload=workflow["metadata"].get("payload", {}),
-                        parent_id=workflow_id,
-                        sender="orchestrator"
-                    )
-                    break
+            original_task = self._original_tasks.get(task_id)
             
             if original_task:
-                logger.info(f"Retrying task {task_id} (attempt {retry_count + 1})")
-                await self.task_queue.put(original_task)
-            else:
-                logger.warning(f"Cannot retry task {task_id}: original task not found")
+                # Increment retry count
+                retry_count = self._retry_counts[task_id]
+                self._retry_counts[task_id] = retry_count + 1
+                logger.info("Retrying task %s (attempt %s)", task_id, retry_count + 1)
+                self.task_queue.put_nowait(original_task)
+                return
+            
+            logger.warning("Cannot retry task %s: original task not found", task_id)
         
         elif strategy == RecoveryStrategy.DECOMPOSE:
-            logger.info(f"Decomposing task {task_id}")
+            logger.info("Decomposing task %s", task_id)
             # In a real implementation, this would break down the task into smaller subtasks
             # For now, we'll just log that we would decompose the task
-            logger.info(f"Task decomposition not implemented yet")
+            logger.info("Task decomposition not implemented yet")
         
         elif strategy == RecoveryStrategy.ESCALATE:
-            logger.warning(f"Escalating task {task_id} for human intervention")
+            logger.warning("Escalating task %s for human intervention", task_id)
             # In a real implementation, this would trigger some form of human intervention
             # For now, we'll just log that we would escalate the task
-            logger.warning(f"Task escalation not implemented yet")
+            logger.warning("Task escalation not implemented yet")
+        
+        else:
+            logger.warning("Recovery strategy %s not implemented yet, giving up on task %s", strategy.value, task_id)
+        
+        # The task will not run again, so neither will the tasks waiting on it
+        self._original_tasks.pop(task_id, None)
+        self._retry_counts.pop(task_id, None)
+        self._skip_dependents(task_id)
     
     def _break_down_task(self, task_description: Dict[str, Any], workflow_id: str) -> List[Dict[str, Any]]:
         """
         Break down a complex task into subtasks.
         
+        The decomposer registered for the task's type is used, and task types without one
+        become a single subtask.
+        
         Args:
             task_description: The description of the task to break down
             workflow_id: The ID of the workflow
             
         Returns:
-            A list of subtask descriptions
-        """
-        # This is a simplified implementation - in a real system, this would be more sophisticated
-        # and would depend on the nature of the task
-        
-        task_type = task_description.get("task_type", "")
-        
-        if task_type == "implement_system":
-            # Break down into design, implementation, and testing
-            return [
-                {
-                    "task_id": str(uuid.uuid4()),
-                    "task_type": "system_design",
-                    "payload": {
-                        "requirements": task_description.get("requirements", []),
-                        "constraints": task_description.get("constraints", [])
-                    },
-                    "metadata": {
-                        "stage": "design",
-                        "parent_task": task_description.get("task_id")
-                    }
-                },
-                {
-                    "task_id": str(uuid.uuid4()),
-                    "task_type": "implement_component",
-                    "payload": {
-                        "component_name": "main",
-                        "requirements": task_description.get("requirements", [])
-                    },
-                    "metadata": {
-                        "stage": "implementation",
-                        "parent_task": task_description.get("task_id")
-                    }
-                },
-                {
-                    "task_id": str(uuid.uuid4()),
-                    "task_type": "test_component",
-                    "payload": {
-                        "component_name": "main",
-                        "requirements": task_description.get("requirements", [])
-                    },
-                    "metadata": {
-                        "stage": "testing",
-                        "parent_task": task_description.get("task_id")
-                    }
-                }
-            ]
-        else:
-            # For other task types, just create a single subtask
-            return [
-                {
-                    "task_id": str(uuid.uuid4()),
-                    "task_type": task_type,
-                    "payload": task_description.get("payload", {}),
-                    "metadata": {
-                        "parent_task": task_description.get("task_id")
-                    }
-                }
-            ]
+            A list of subtask descriptions, each listing the IDs of the subtasks it
+            depends on under "depends_on"
+        """
+        decomposer = self._decomposers.get(task_description.get("task_type", ""), _decompose_single_task)
+        return decomposer(task_description, workflow_id)
     
     async def broadcast_message(self, message: Message) -> None:
         """
@@ -975,11 +1778,28 @@ class Orchestrator:
         Args:
             message: The message to broadcast
         """
-        for agent_type, agent in self.agents.items():
-            if agent:
-                # In a real implementation, this would use the agent's interface to send the message
-                logger.debug(f"Broadcasting message to {agent_type}")
-                # await agent.receive_message(message)
+        # Deliver to all agents at once, so one slow or failing agent does not hold up the rest
+        recipients = [(agent_type, agent) for agent_type, agent in self.agents.items() if agent]
+        outcomes = await asyncio.gather(
+            *(self._deliver_broadcast(agent_type, agent, message) for agent_type, agent in recipients),
+            return_exceptions=True
+        )
+        for (agent_type, _), outcome in zip(recipients, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Error broadcasting message to %s: %s", agent_type, outcome)
+    
+    async def _deliver_broadcast(self, agent_type: str, agent: Any, message: Message) -> None:
+        """
+        Deliver a broadcast message to one agent.
+        
+        Args:
+            agent_type: The type of the agent
+            agent: The agent instance
+            message: The message to deliver
+        """
+        # In a real implementation, this would use the agent's interface to send the message
+        logger.debug("Broadcasting message to %s", agent_type)
+        # await agent.receive_message(message)
     
     async def send_message(self, recipient: str, message: Message) -> None:
         """
@@ -989,13 +1809,14 @@ class Orchestrator:
             recipient: The type of agent to send the message to
             message: The message to send
         """
-        if recipient in self.agents and self.agents[recipient]:
+        agent = self.agents.get(recipient)
+        if agent:
             # In a real implementation, this would use the agent's interface to send the message
-            logger.debug(f"Sending message to {recipient}")
+            logger.debug("Sending message to %s", recipient)
             message.recipient = recipient
-            # await self.agents[recipient].receive_message(message)
+            # await agent.receive_message(message)
         else:
-            logger.warning(f"Cannot send message to unknown agent: {recipient}")
+            logger.warning("Cannot send message to unknown agent: %s", recipient)
     
     def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """
@@ -1009,19 +1830,26 @@ class Orchestrator:
         """
         return self.workflow_state.get_workflow_status(workflow_id)
     
-    def get_queue_status(self) -> Dict[str, int]:
+    def get_queue_status(self) -> QueueStatus:
         """
         Get the current status of all task queues.
         
         Returns:
-            A dictionary with the count of tasks in each queue
-        """
-        return {
-            "task_queue": self.task_queue.get_task_count(),
-            "response_queue": self.response_queue.qsize(),
-            "status_queue": self.status_queue.qsize(),
-            "error_queue": self.error_queue.qsize()
-        }
+            A QueueStatus with the count of tasks in each queue, read by attribute
+            (status.error_queue); _asdict() gives the equivalent dictionary
+        """
+        return QueueStatus(
+            self.task_queue.get_task_count(),
+            self.response_queue.qsize(),
+            self.status_queue.qsize(),
+            self.error_queue.qsize()
+        )
+    
+    def clear_result_cache(self) -> None:
+        """Forget all cached task results, so every task submitted afterwards runs again."""
+        if self._result_cache is not None:
+            self._result_cache.clear()
+            logger.info("Cleared the task result cache")
     
     def set_default_model(self, model_name: str) -> bool:
         """
@@ -1037,7 +1865,7 @@ class Orchestrator:
         if success:
             # Update the configuration
             config.set("model.default", model_name)
-            logger.info(f"Default model set to: {model_name}")
+            logger.info("Default model set to: %s", model_name)
         return success
     
     def get_available_models(self) -> List[str]:
@@ -1061,14 +1889,153 @@ class Orchestrator:
         """
         return self.model_registry.get_model(model_name)
     
+    def _load_state(self) -> None:
+        """
+        Restore the state saved by a previous shutdown, if any.
+        
+        A state file that cannot be read or restored is logged and ignored, and the
+        Orchestrator starts with no saved state.
+        """
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as state_file:
+                state = json.load(state_file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Could not load saved orchestrator state from %s: %s", self._state_path, e)
+            return
+        
+        try:
+            self._restore_state(state)
+        except Exception as e:
+            logger.warning("Ignoring saved orchestrator state in %s: %s", self._state_path, e)
+            
+            # Drop whatever was restored before the failure; nothing else has run yet
+            self.task_queue = TaskQueue()
+            self.workflow_state = WorkflowState()
+            self._original_tasks.clear()
+            self._retry_counts.clear()
+            self._blocked_tasks.clear()
+            self._dependents.clear()
+    
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore state saved by _export_state().
+        
+        Unfinished tasks are queued or blocked again as they were. Subtasks of unfinished
+        workflows that were not saved are recorded as failed, so every workflow can finish.
+        
+        Args:
+            state: The saved state
+            
+        Raises:
+            Exception: If the state does not have the expected structure; the Orchestrator
+                may then be partly restored
+        """
+        workflow_state = self.workflow_state
+        restored_workflows = workflow_state.restore_state(state["workflow_state"])
+        
+        restored_tasks = set()
+        for saved_task in state["tasks"]:
+            content = saved_task["content"]
+            task_id = content["task_id"]
+            task = Task.fast_create(
+                task_id,
+                content["task_type"],
+                content["payload"],
+                metadata=content.get("metadata"),
+                parent_id=content.get("parent_id"),
+                priority=Priority(saved_task["priority"]),
+                sender="orchestrator"
+            )
+            restored_tasks.add(task_id)
+            
+            waiting_on = saved_task["waiting_on"]
+            if waiting_on:
+                self._blocked_tasks[task_id] = (task, set(waiting_on))
+                for dependency_id in waiting_on:
+                    self._dependents[dependency_id].append(task_id)
+            else:
+                self._original_tasks[task_id] = task
+                self.task_queue.put_nowait(task)
+        
+        self._retry_counts.update(
+            (task_id, count) for task_id, count in state["retry_counts"].items() if task_id in restored_tasks
+        )
+        
+        for workflow_id in restored_workflows:
+            workflow = workflow_state.get_workflow_status(workflow_id)
+            if workflow["pending"] == 0:
+                continue
+            for task_id in workflow["subtasks"]:
+                if task_id not in workflow["results"] and task_id not in restored_tasks:
+                    workflow_state.update_task_status(
+                        task_id,
+                        TaskStatus.FAILED,
+                        {"status": "failed", "error": "Task was lost when the orchestrator restarted"}
+                    )
+        
+        logger.info("Restored orchestrator state from %s with %s unfinished tasks", self._state_path, len(restored_tasks))
+    
+    def _export_state(self) -> str:
+        """
+        Serialize the state restored by _load_state().
+        
+        Returns:
+            The workflow state, retry counts, and unfinished tasks as JSON; values JSON cannot
+            represent, such as unusual task results, are saved as strings
+        """
+        saved_tasks = [
+            {"content": task.content, "priority": task.priority.value, "waiting_on": []}
+            for task in self._original_tasks.values()
+        ]
+        saved_tasks.extend(
+            {"content": task.content, "priority": task.priority.value, "waiting_on": sorted(waiting_on)}
+            for task, waiting_on in self._blocked_tasks.values()
+        )
+        return json.dumps({
+            "workflow_state": self.workflow_state.export_state(),
+            "retry_counts": self._retry_counts,
+            "tasks": saved_tasks
+        }, default=str)
+    
+    def _write_state(self, data: str) -> None:
+        """
+        Write saved orchestrator state, replacing any earlier save in one step.
+        
+        Args:
+            data: The serialized state
+        """
+        temp_path = self._state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            state_file.write(data)
+        os.replace(temp_path, self._state_path)
+        logger.info("Saved orchestrator state to %s", self._state_path)
+    
     async def shutdown(self) -> None:
         """
         Gracefully shut down the Orchestrator.
         
         This method ensures that all tasks are properly saved and resources are released.
+        When a cache directory is configured, workflow state, retry counts, and unfinished
+        tasks are saved there and restored by the next Orchestrator.
         """
         logger.info("Shutting down Orchestrator")
-        # In a real implementation, this would save state, close connections, etc.
+        
+        # Let asynchronous callbacks that are still running finish; their errors are logged
+        # as they complete
+        if self._callback_tasks:
+            await asyncio.gather(*self._callback_tasks, return_exceptions=True)
+        
+        if self._state_path:
+            try:
+                # Serialize on the event loop so no task changes the state mid-dump, and only
+                # write the file from a worker thread
+                await asyncio.to_thread(self._write_state, self._export_state())
+            except Exception as e:
+                logger.error("Error saving orchestrator state: %s", e)
+        if isinstance(self._result_cache, shelve.Shelf):
+            self._result_cache.close()
 
 
 # Example usage